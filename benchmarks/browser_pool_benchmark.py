@@ -0,0 +1,97 @@
+"""
+Compares Selenium listing throughput (pages per minute) of the old
+one-browser-per-page pool against the long-lived BrowserWorker pool.
+
+Usage:
+    uv run benchmarks/browser_pool_benchmark.py "<filtered pracuj.pl url>" --pages 10
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.index_scrapper import (  # noqa: E402
+    BROWSER_RESTART_AFTER_PAGES,
+    PageNavigator,
+    ScraperManager,
+    SeleniumScraper,
+)
+
+SECONDS_PER_MINUTE = 60
+
+
+def _scrape_with_fresh_browser(args: tuple[str, bool, str]) -> list[str]:
+    """The previous design: launch and quit a browser for every page."""
+    url, headless, browser = args
+    scraper = SeleniumScraper(headless=headless, browser=browser)
+    try:
+        return scraper.scrape_urls(url)
+    finally:
+        scraper.close_driver()
+
+
+def run_per_page_design(urls: list[str], headless: bool, browser: str) -> int:
+    num_processes = max(min(multiprocessing.cpu_count() - 1, len(urls)), 1)
+    collected = 0
+    with multiprocessing.Pool(processes=num_processes) as pool:
+        tasks = [(url, headless, browser) for url in urls]
+        for res in pool.imap_unordered(_scrape_with_fresh_browser, tasks):
+            collected += len(res)
+    return collected
+
+
+def run_worker_pool_design(
+    urls: list[str], headless: bool, browser: str, restart_after_pages: int
+) -> int:
+    manager = ScraperManager(
+        urls[0],
+        headless=headless,
+        browser=browser,
+        restart_after_pages=restart_after_pages,
+    )
+    return sum(len(res) for res in manager._iter_browser_results(urls))
+
+
+def measure(name: str, pages: int, run) -> None:
+    start = time.perf_counter()
+    collected = run()
+    elapsed = time.perf_counter() - start
+    pages_per_minute = pages / elapsed * SECONDS_PER_MINUTE
+    print(
+        f"{name:<14} {pages:>5} pages {elapsed:>8.1f}s "
+        f"{pages_per_minute:>8.1f} pages/min {collected:>6} offers"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("url", help="Filtered pracuj.pl listing URL")
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--browser", choices=["firefox", "chrome"], default="firefox")
+    parser.add_argument("--show-browser", action="store_true")
+    parser.add_argument(
+        "--restart-after-pages", type=int, default=BROWSER_RESTART_AFTER_PAGES
+    )
+    args = parser.parse_args()
+
+    urls = PageNavigator(args.url).generate_all_page_urls()[: args.pages]
+    headless = not args.show_browser
+    measure(
+        "per-page",
+        len(urls),
+        lambda: run_per_page_design(urls, headless, args.browser),
+    )
+    measure(
+        "worker-pool",
+        len(urls),
+        lambda: run_worker_pool_design(
+            urls, headless, args.browser, args.restart_after_pages
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
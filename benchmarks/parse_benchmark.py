@@ -0,0 +1,115 @@
+"""
+Measures per-page parse time and memory of every listing parser backend
+on listing pages saved under benchmarks/fixtures, and of the offer page
+parser and classifier on saved offer pages.
+
+Usage:
+    uv run benchmarks/parse_benchmark.py --repeat 50
+    uv run benchmarks/parse_benchmark.py --save "<filtered pracuj.pl url>" --pages 5
+
+The committed fixtures are anonymised: employers, addresses and ids are placeholders.
+`--save` adds real pages (`listing_<n>.html` and `offer_<n>.html`), fetched without
+cookies so they hold no account data.
+
+Memory is the tracemalloc peak, which only sees allocations made through the
+Python allocator; the C trees built by selectolax and lxml are under-counted.
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.index_scrapper import PageNavigator, REQUEST_TIMEOUT  # noqa: E402
+from src.offer_classifier import classify_offer_page  # noqa: E402
+from src.offer_parser import LISTING_BACKENDS, parse_listing, parse_offer_page  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+MILLISECONDS_PER_SECOND = 1000
+BYTES_PER_KIB = 1024
+
+
+OFFER_PARSERS = {
+    "offer_page": lambda page_source: parse_offer_page(page_source, "fixture"),
+    "classifier": lambda page_source: classify_offer_page("fixture", page_source),
+}
+
+
+def save_page(navigator: PageNavigator, url: str, name: str) -> str:
+    response = navigator.session.get(url, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    fixture = FIXTURES_DIR / name
+    fixture.write_text(response.text, encoding="utf-8")
+    print(f"Saved {url} -> {fixture}")
+    return response.text
+
+
+def save_fixtures(url: str, pages: int) -> None:
+    """Saves the first `pages` listing pages and the first offer of each."""
+    navigator = PageNavigator(url)
+    FIXTURES_DIR.mkdir(parents=True, exist_ok=True)
+    for page_num, page_url in enumerate(navigator.generate_all_page_urls()[:pages], 1):
+        page_source = save_page(navigator, page_url, f"listing_{page_num}.html")
+        offer_urls = parse_listing(page_source).offer_urls
+        if offer_urls:
+            save_page(navigator, offer_urls[0], f"offer_{page_num}.html")
+
+
+def measure_parse_time(parse, page_source: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parse(page_source)
+    return (time.perf_counter() - start) / repeat * MILLISECONDS_PER_SECOND
+
+
+def measure_peak_memory(parse, page_source: str) -> float:
+    tracemalloc.start()
+    parse(page_source)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / BYTES_PER_KIB
+
+
+def print_row(fixture: Path, name: str, offers: str, parse, page_source: str, repeat: int):
+    parse_ms = measure_parse_time(parse, page_source, repeat)
+    peak_kib = measure_peak_memory(parse, page_source)
+    print(f"{fixture.name:<20} {name:<11} {offers:>6} {parse_ms:>9.2f} {peak_kib:>9.0f}")
+
+
+def run_benchmark(repeat: int) -> None:
+    listing_fixtures = sorted(FIXTURES_DIR.glob("listing_*.html"))
+    offer_fixtures = sorted(FIXTURES_DIR.glob("offer_*.html"))
+    if not listing_fixtures and not offer_fixtures:
+        print(f"No fixtures in {FIXTURES_DIR}, record some with --save first.")
+        return
+
+    print(f"{'fixture':<20} {'backend':<11} {'offers':>6} {'ms/page':>9} {'peak KiB':>9}")
+    for fixture in listing_fixtures:
+        page_source = fixture.read_text(encoding="utf-8")
+        for name, parse in LISTING_BACKENDS.items():
+            listing = parse(page_source)
+            offers = str(len(listing.offers) if listing else 0)
+            print_row(fixture, name, offers, parse, page_source, repeat)
+    for fixture in offer_fixtures:
+        page_source = fixture.read_text(encoding="utf-8")
+        for name, parse in OFFER_PARSERS.items():
+            print_row(fixture, name, "-", parse, page_source, repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--save", metavar="URL", help="Record listing fixtures from URL")
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.save:
+        save_fixtures(args.save, args.pages)
+    run_benchmark(args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
-from src.cli import collect_config_interactive
+from src.cli import CONFIG_FILE, collect_config_interactive, load_all_configs
 from src.applier import Applier
+from src.multi_search import MultiSearchCrawler
+import argparse
 import sys
 import os
 
@@ -22,10 +24,42 @@ def create_data_directories():
             os.makedirs(subdir_path)
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Automate job applications on pracuj.pl.")
+    parser.add_argument(
+        "--batch",
+        nargs="*",
+        metavar="USERNAME",
+        help="Run saved configs without prompts, sharing one crawl across them "
+        "(all configs when no usernames are given).",
+    )
+    return parser.parse_args()
+
+
+def run_batch(usernames: list[str]):
+    configs = load_all_configs(CONFIG_FILE)
+    selected = [
+        config
+        for username, config in configs.items()
+        if not usernames or username in usernames
+    ]
+    if not selected:
+        sys.exit(f"No saved configs matching {usernames or 'any user'} in {CONFIG_FILE}.")
+    MultiSearchCrawler(selected).run()
+
+
 def run_code():
     create_data_directories()
+    args = parse_args()
+    if args.batch is not None:
+        run_batch(args.batch)
+        return
     config = collect_config_interactive()
-    Applier(config).apply()
+    applier = Applier(config)
+    try:
+        applier.apply()
+    finally:
+        applier.close()
 
 
 run_code()
@@ -0,0 +1,81 @@
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+# --- Constants ---
+# Attributes that describe form fields; layout and ARIA state attributes are left out.
+# This only changes which attributes each element is serialized with, not which elements
+# the model sees.
+FORM_ATTRIBUTES = [
+    "type",
+    "id",
+    "name",
+    "value",
+    "placeholder",
+    "aria-label",
+    "checked",
+    "required",
+    "accept",
+    "multiple",
+    "pattern",
+    "maxlength",
+]
+DEFAULT_PROFILE = "default"
+
+
+class AgentProfile(BaseModel):
+    """
+    How the browser agent sees and drives a form. The default profile keeps the browser_use
+    defaults; lighter profiles trade the vision loop for a text-only page state.
+    """
+
+    name: str
+    use_vision: bool = True
+    include_attributes: Optional[list[str]] = None
+    max_actions_per_step: int = 5
+    max_clickable_elements_length: int = 40000
+    # None follows ApplierConfig.headless.
+    headless: Optional[bool] = None
+    highlight_elements: bool = True
+
+    def agent_settings(self) -> dict[str, Any]:
+        """Keyword arguments for `browser_use.Agent`."""
+        return {
+            "use_vision": self.use_vision,
+            "include_attributes": self.include_attributes,
+            "max_actions_per_step": self.max_actions_per_step,
+            "max_clickable_elements_length": self.max_clickable_elements_length,
+        }
+
+    def session_settings(self, headless: bool) -> dict[str, Any]:
+        """Keyword arguments for `browser_use.BrowserSession`."""
+        return {
+            "headless": headless if self.headless is None else self.headless,
+            "highlight_elements": self.highlight_elements,
+        }
+
+
+AGENT_PROFILES = {
+    DEFAULT_PROFILE: AgentProfile(name=DEFAULT_PROFILE),
+    # Most external forms are plain text inputs: no screenshots and several fields filled per
+    # LLM call. The element list is cut off at `max_clickable_elements_length` characters,
+    # which is what bounds its size; `include_attributes` only trims each element.
+    "fast": AgentProfile(
+        name="fast",
+        use_vision=False,
+        include_attributes=FORM_ATTRIBUTES,
+        max_actions_per_step=10,
+        max_clickable_elements_length=20000,
+        headless=True,
+        highlight_elements=False,
+    ),
+}
+
+
+def get_agent_profile(name: str) -> AgentProfile:
+    try:
+        return AGENT_PROFILES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown agent profile: {name}. Available: {', '.join(AGENT_PROFILES)}"
+        )
@@ -0,0 +1,128 @@
+import asyncio
+import time
+from enum import Enum
+from typing import Awaitable, Callable, Iterable, Optional
+
+from pydantic import BaseModel
+
+from src.driver_pool import cap_driver_count
+from src.logger import SingletonLogger
+
+# --- Constants ---
+DEFAULT_AGENT_CONCURRENCY = 3
+AGENT_TIMEOUT_SECONDS = 15 * 60
+# Time a job gets past its own deadline to stop the agent and release its browser before
+# the scheduler cancels it.
+AGENT_STOP_GRACE_SECONDS = 60
+# A browser_use agent waits on the LLM for most of a step and makes about one call per step.
+AGENT_SECONDS_PER_STEP = 10
+SECONDS_PER_MINUTE = 60
+# Chromium with a single application form open.
+AGENT_BROWSER_MEMORY_BYTES = 500 * 1024 * 1024
+
+logger = SingletonLogger().get_logger()
+
+
+class AgentJobStatus(str, Enum):
+    APPLIED = "applied"
+    FAILED = "failed"
+    TIMED_OUT = "timed_out"
+    CANCELLED = "cancelled"
+
+
+class AgentRunReport(BaseModel):
+    """What a finished job reports back: whether it applied, why not, and the LLM tokens it used."""
+
+    applied: bool
+    error: Optional[str] = None
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+
+class AgentJobResult(BaseModel):
+    url: str
+    status: AgentJobStatus
+    error: Optional[str] = None
+    duration: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+
+def agent_concurrency(
+    requested: Optional[int] = None, requests_per_minute: Optional[int] = None
+) -> int:
+    """
+    Number of agents to run at once. Agents are I/O bound, so the limits are how many
+    LLM calls per minute the provider allows and how many browsers fit in memory,
+    not the number of CPUs.
+    """
+    concurrency = requested or DEFAULT_AGENT_CONCURRENCY
+    if requests_per_minute:
+        concurrency = min(
+            concurrency,
+            max(1, requests_per_minute * AGENT_SECONDS_PER_STEP // SECONDS_PER_MINUTE),
+        )
+    return cap_driver_count(concurrency, AGENT_BROWSER_MEMORY_BYTES)
+
+
+class AgentScheduler:
+    """
+    Runs browser agent jobs concurrently in one event loop.
+    At most `max_concurrency` jobs run at a time, each is cancelled after `job_timeout`
+    seconds, and every outcome is passed to `on_result` as soon as it is known.
+    `run_job(url)` returns an `AgentRunReport`; jobs that time out or are cancelled
+    report no token usage.
+    """
+
+    def __init__(
+        self,
+        run_job: Callable[[str], Awaitable[AgentRunReport]],
+        max_concurrency: int = DEFAULT_AGENT_CONCURRENCY,
+        job_timeout: float = AGENT_TIMEOUT_SECONDS,
+        on_result: Optional[Callable[[AgentJobResult], None]] = None,
+    ):
+        self.run_job = run_job
+        self.max_concurrency = max_concurrency
+        self.job_timeout = job_timeout
+        self.on_result = on_result
+
+    async def _run_one(self, url: str, semaphore: asyncio.Semaphore) -> AgentJobResult:
+        started = time.monotonic()
+        report = AgentRunReport(applied=False)
+        try:
+            async with semaphore:
+                started = time.monotonic()
+                logger.info(f"Starting job application for URL: {url}")
+                report = await asyncio.wait_for(self.run_job(url), self.job_timeout)
+            status = AgentJobStatus.APPLIED if report.applied else AgentJobStatus.FAILED
+            error = None
+            if not report.applied:
+                error = report.error or "Agent did not finish the application"
+        except asyncio.TimeoutError:
+            status = AgentJobStatus.TIMED_OUT
+            error = f"Timed out after {self.job_timeout:.0f}s"
+        except asyncio.CancelledError:
+            # Ctrl+C makes asyncio.run cancel every job; they stay queued for the next run.
+            status, error = AgentJobStatus.CANCELLED, "Cancelled"
+        except Exception as e:
+            status, error = AgentJobStatus.FAILED, str(e)
+        result = AgentJobResult(
+            url=url,
+            status=status,
+            error=error,
+            duration=time.monotonic() - started,
+            prompt_tokens=report.prompt_tokens,
+            completion_tokens=report.completion_tokens,
+        )
+        logger.info(
+            f"Job application for {url} {status.value} in {result.duration:.0f}s, "
+            f"{result.prompt_tokens} prompt / {result.completion_tokens} completion tokens"
+        )
+        if self.on_result is not None:
+            self.on_result(result)
+        return result
+
+    async def run(self, urls: Iterable[str]) -> list[AgentJobResult]:
+        """Runs a job for every URL and returns the results in input order."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        return await asyncio.gather(*(self._run_one(url, semaphore) for url in urls))
@@ -0,0 +1,87 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit
+
+from browser_use import Agent
+from browser_use.browser import BrowserSession
+
+from src.logger import SingletonLogger
+
+# --- Constants ---
+BASE_DIR = Path(__file__).resolve().parent.parent
+TEMPLATES_DIR = BASE_DIR / "data" / "agent_templates"
+FINGERPRINT_LENGTH = 16
+# Describes the visible form fields of the page: tag, type, name and whether it is required.
+FORM_FIELDS_JS = """() => Array.from(document.querySelectorAll('input, select, textarea'))
+    .filter((field) => field.type !== 'hidden')
+    .map((field) => [
+        field.tagName.toLowerCase(),
+        field.type || '',
+        field.name || field.id || '',
+        field.required,
+    ])"""
+
+logger = SingletonLogger().get_logger()
+
+
+def ats_domain(url: str) -> str:
+    """Host of an application URL without `www.`, which identifies the applicant tracking system."""
+    host = (urlsplit(url).hostname or "").lower()
+    return host.removeprefix("www.")
+
+
+async def form_fingerprint(browser_session: BrowserSession) -> Optional[str]:
+    """
+    Short hash of the form fields on the current page, stable across offers on the same ATS
+    form. None when the page shows no fields yet, e.g. an offer page with an "Apply" button,
+    since every such page on a shared ATS host would otherwise hash alike.
+    """
+    page = await browser_session.must_get_current_page()
+    fields = json.loads(await page.evaluate(FORM_FIELDS_JS) or "[]")
+    if not fields:
+        return None
+    digest = hashlib.sha256(json.dumps(sorted(fields)).encode()).hexdigest()
+    return digest[:FINGERPRINT_LENGTH]
+
+
+class TemplateStore:
+    """
+    Action traces of successful agent runs, stored per user under
+    `data/agent_templates/<username>/<ATS domain>/<form fingerprint>.json`.
+    A trace holds the element selectors, typed values and uploads of one application,
+    so it is kept per user and replayed only on a form with the same fingerprint.
+    """
+
+    def __init__(self, username: str, root: Path = TEMPLATES_DIR):
+        self.root = Path(root) / username
+
+    def path(self, url: str, fingerprint: str) -> Path:
+        return self.root / ats_domain(url) / f"{fingerprint}.json"
+
+    def find(self, url: str, fingerprint: str) -> Optional[Path]:
+        path = self.path(url, fingerprint)
+        return path if path.exists() else None
+
+    def save(self, agent: Agent, url: str, fingerprint: str):
+        """
+        Stores the trace of a finished agent. The initial navigation (step 0) points at
+        the offer it was recorded on, so it is left out; replays start on the form.
+        """
+        history = agent.history.model_copy(
+            update={
+                "history": [
+                    item
+                    for item in agent.history.history
+                    if not item.metadata or item.metadata.step_number != 0
+                ]
+            }
+        )
+        path = self.path(url, fingerprint)
+        history.save_to_file(path)
+        logger.info(f"Saved application template for {ats_domain(url)} to {path}")
+
+    def discard(self, url: str, fingerprint: str):
+        """Drops a template that no longer replays, so the next successful run re-records it."""
+        self.path(url, fingerprint).unlink(missing_ok=True)
@@ -0,0 +1,159 @@
+import re
+import sqlite3
+import threading
+import unicodedata
+from datetime import datetime, timezone
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import ContextManager, Optional
+
+from pydantic import BaseModel
+
+from src.logger import SingletonLogger
+from src.storage import connect_sqlite, init_sqlite
+
+# --- Constants ---
+BASE_DIR = Path(__file__).resolve().parent.parent
+ANSWERS_PATH = BASE_DIR / "data" / "answers.sqlite"
+# High enough that "brutto" and "netto" variants of a question do not share an answer.
+FUZZY_MATCH_THRESHOLD = 0.92
+NON_WORD_PATTERN = re.compile(r"[^\w\s]")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+logger = SingletonLogger().get_logger()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+    username TEXT NOT NULL,
+    question_key TEXT NOT NULL,
+    question TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    uses INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (username, question_key)
+)
+"""
+
+
+def normalize_question(question: str) -> str:
+    """
+    Key under which a form question is stored: lowercase, without diacritics,
+    punctuation or repeated whitespace, so 'Oczekiwania finansowe (brutto)?' and
+    'oczekiwania finansowe brutto' share one answer.
+    """
+    decomposed = unicodedata.normalize("NFKD", question.replace("ł", "l").replace("Ł", "L"))
+    ascii_text = "".join(char for char in decomposed if not unicodedata.combining(char))
+    words = NON_WORD_PATTERN.sub(" ", ascii_text.lower())
+    return WHITESPACE_PATTERN.sub(" ", words).strip()
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class AnswerStats(BaseModel):
+    exact_hits: int = 0
+    fuzzy_hits: int = 0
+    misses: int = 0
+    saved: int = 0
+
+    @property
+    def llm_calls_avoided(self) -> int:
+        # Every reused answer is a question the agent did not have to reason out with the LLM.
+        return self.exact_hits + self.fuzzy_hits
+
+    def summary(self) -> str:
+        lookups = self.exact_hits + self.fuzzy_hits + self.misses
+        return (
+            f"{lookups} questions looked up, {self.llm_calls_avoided} answered from cache "
+            f"({self.fuzzy_hits} by fuzzy match), {self.saved} new answers saved"
+        )
+
+
+class AnswerCache:
+    """
+    Persistent per-user answers to recurring application form questions (salary
+    expectation, notice period, availability, consent, language level), stored in SQLite.
+    Questions are matched on their normalized text, then by similarity ratio.
+    """
+
+    def __init__(
+        self,
+        username: str,
+        path: Path = ANSWERS_PATH,
+        fuzzy_threshold: float = FUZZY_MATCH_THRESHOLD,
+    ):
+        self.username = username
+        self.path = Path(path)
+        self.fuzzy_threshold = fuzzy_threshold
+        self.stats = AnswerStats()
+        self._stats_lock = threading.Lock()
+        init_sqlite(self.path, SCHEMA)
+
+    def _connect(self) -> ContextManager[sqlite3.Connection]:
+        return connect_sqlite(self.path)
+
+    def _record(self, outcome: str):
+        with self._stats_lock:
+            setattr(self.stats, outcome, getattr(self.stats, outcome) + 1)
+
+    def _closest_key(self, connection: sqlite3.Connection, key: str) -> Optional[str]:
+        best_key, best_ratio = None, self.fuzzy_threshold
+        for (candidate,) in connection.execute(
+            "SELECT question_key FROM answers WHERE username = ?", (self.username,)
+        ):
+            ratio = SequenceMatcher(None, key, candidate).ratio()
+            if ratio >= best_ratio:
+                best_key, best_ratio = candidate, ratio
+        return best_key
+
+    def lookup(self, question: str) -> Optional[str]:
+        key = normalize_question(question)
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT answer FROM answers WHERE username = ? AND question_key = ?",
+                (self.username, key),
+            ).fetchone()
+            outcome = "exact_hits"
+            if row is None:
+                matched_key = self._closest_key(connection, key)
+                if matched_key is None:
+                    self._record("misses")
+                    return None
+                outcome = "fuzzy_hits"
+                key = matched_key
+                row = connection.execute(
+                    "SELECT answer FROM answers WHERE username = ? AND question_key = ?",
+                    (self.username, key),
+                ).fetchone()
+            connection.execute(
+                "UPDATE answers SET uses = uses + 1 WHERE username = ? AND question_key = ?",
+                (self.username, key),
+            )
+        self._record(outcome)
+        return row[0]
+
+    def save(self, question: str, answer: str):
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT INTO answers (username, question_key, question, answer, updated_at) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (username, question_key) DO UPDATE SET "
+                "answer = excluded.answer, question = excluded.question, "
+                "updated_at = excluded.updated_at",
+                (self.username, normalize_question(question), question, answer, _now()),
+            )
+        self._record("saved")
+        logger.debug(f"Saved answer to '{question}'")
+
+
+_default_caches: dict[str, AnswerCache] = {}
+_default_caches_lock = threading.Lock()
+
+
+def default_answer_cache(username: str) -> AnswerCache:
+    """Process-wide cache per user, so the statistics of concurrent agents add up."""
+    with _default_caches_lock:
+        if username not in _default_caches:
+            _default_caches[username] = AnswerCache(username)
+        return _default_caches[username]
@@ -1,18 +1,78 @@
 from pydantic import BaseModel, Field
-from src.login_selenium import PracujLogin
-from src.index_scrapper import ScraperManager
+from requests.cookies import RequestsCookieJar
+from src.login_selenium import (
+    CookieManager,
+    PracujLogin,
+    SessionRefresher,
+    add_cookies_to_jar,
+)
+from src.driver_pool import DriverPool
+from src.index_scrapper import (
+    INCREMENTAL_OVERLAP_PAGES,
+    ScraperManager,
+    create_http_session,
+)
 from src.logger import SingletonLogger
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
-from selenium.common.exceptions import TimeoutException
-from src.browser_use_applier import JobApplier
-from typing import Optional
-import multiprocessing
+from selenium.common.exceptions import (
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+from src.browser_use_applier import DEFAULT_MAX_STEPS, JobApplier
+from src.agent_profiles import DEFAULT_PROFILE, get_agent_profile
+from src.answer_cache import default_answer_cache
+from src.llm_pool import LlmLimits, default_llm_registry
+from src.browser_session_pool import BrowserSessionPool
+from src.agent_scheduler import (
+    AGENT_STOP_GRACE_SECONDS,
+    AGENT_TIMEOUT_SECONDS,
+    AgentJobResult,
+    AgentJobStatus,
+    AgentRunReport,
+    AgentScheduler,
+    agent_concurrency,
+)
+from src.offer_ledger import OfferLedger, OfferState
+from src.offer_parser import canonical_offer_id
+from src.offer_classifier import (
+    SKIPPED_VERDICTS,
+    OfferClassification,
+    OfferClassifier,
+    OfferVerdict,
+)
+from src.http_cache import default_http_cache
+from src.rate_limiter import default_rate_limiter, is_throttled
+from src.page_selectors import (
+    ALREADY_APPLIED_MARKERS,
+    CONTINUE_BUTTON_SELECTOR,
+    EXPIRED_OFFER_MARKERS,
+    FAST_APPLY_SELECTOR,
+    NORMAL_APPLY_SELECTOR,
+)
+from typing import Iterable, Iterator, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from collections import deque
+from enum import Enum
+from urllib.parse import urlsplit
+import asyncio
+import queue
 
 # --- Constants ---
-FAST_APPLY_SELECTOR = ".quick-apply_s1i8itcr > a:nth-child(2)"
-NORMAL_APPLY_SELECTOR = ".quick-apply_s47rwpe > div:nth-child(1) > a:nth-child(1)"
-CONTINUE_BUTTON_SELECTOR = "button.ui-library_b14qiyz3:nth-child(1)"
+WORK_QUEUE_SIZE_PER_DRIVER = 2
+WORK_QUEUE_POLL_SECONDS = 0.5
+PRELOAD_TABS = 2
+MILLISECONDS_PER_SECOND = 1000
+# Response time of the tab's document once it is parsed and served from the given host;
+# null while the tab is still loading or has not left about:blank.
+NAVIGATION_RESPONSE_END_JS = """
+const entry = performance.getEntriesByType('navigation')[0];
+if (document.readyState === 'loading' || location.hostname !== arguments[0] || !entry) {
+    return null;
+}
+return entry.responseEnd || null;
+"""
 
 logger = SingletonLogger().get_logger()
 
@@ -30,9 +90,83 @@ class ApplierConfig(BaseModel):
     base_url: Optional[str] = None
     provider: Optional[str] = None
     api_key: Optional[str] = None
+    incremental: bool = False
+    incremental_overlap_pages: int = INCREMENTAL_OVERLAP_PAGES
+    classify_over_http: bool = True
+    apply_drivers: int = 1
+    preload_tabs: int = PRELOAD_TABS
+    agent_concurrency: Optional[int] = None
+    llm_requests_per_minute: Optional[int] = None
+    llm_tokens_per_minute: Optional[int] = None
+    agent_timeout_seconds: float = AGENT_TIMEOUT_SECONDS
+    agent_max_steps: int = DEFAULT_MAX_STEPS
+    agent_profile: str = DEFAULT_PROFILE
+    replay_templates: bool = True
+    compact_cv: bool = True
+
+
+class ClickOutcome(str, Enum):
+    FAST_APPLIED = "fast_applied"
+    EXTERNAL = "external"
+    EXPIRED = "expired"
+    ALREADY_APPLIED = "already_applied"
+    NOT_FOUND = "not_found"
+
+
+class ClickResult(BaseModel):
+    outcome: ClickOutcome
+    external_url: Optional[str] = None
 
 
 # --- Classes ---
+class ApplyTarget(str, Enum):
+    """What an offer page shows where the apply button should be."""
+
+    FAST_APPLY = "fast_apply"
+    NORMAL_APPLY = "normal_apply"
+    EXPIRED = "expired"
+    ALREADY_APPLIED = "already_applied"
+
+
+APPLY_BUTTON_SELECTORS = {
+    # Fast apply comes first so it wins when both buttons are rendered.
+    ApplyTarget.FAST_APPLY: FAST_APPLY_SELECTOR,
+    ApplyTarget.NORMAL_APPLY: NORMAL_APPLY_SELECTOR,
+}
+PAGE_TEXT_MARKERS = {
+    ApplyTarget.EXPIRED: EXPIRED_OFFER_MARKERS,
+    ApplyTarget.ALREADY_APPLIED: ALREADY_APPLIED_MARKERS,
+}
+
+
+def _clickable(driver, selector: str):
+    for element in driver.find_elements(By.CSS_SELECTOR, selector):
+        if element.is_displayed() and element.is_enabled():
+            return element
+    return None
+
+
+class first_apply_target:
+    """
+    Wait condition that watches every apply button and page marker at once and resolves
+    to `(target, element)` for whichever shows up first; `element` is None for markers.
+    """
+
+    def __call__(self, driver):
+        try:
+            body_text = driver.find_element(By.TAG_NAME, "body").text
+            for target, markers in PAGE_TEXT_MARKERS.items():
+                if any(marker in body_text for marker in markers):
+                    return target, None
+            for target, selector in APPLY_BUTTON_SELECTORS.items():
+                element = _clickable(driver, selector)
+                if element is not None:
+                    return target, element
+        except StaleElementReferenceException:
+            pass
+        return False
+
+
 class ClickApply:
     """Handles clicking 'apply' buttons on a job application page."""
 
@@ -40,72 +174,165 @@ class ClickApply:
         self.driver = driver
         self.wait = wait
 
-    def _click_button(self, selector: str) -> bool:
-        """Clicks a button specified by a CSS selector."""
+    def _wait_for_continue_or_window(self, known_windows: set[str]):
+        """
+        Some normal applications open the employer page straight away, others ask for
+        confirmation first, so both are watched in a single wait.
+        """
+
+        def condition(driver):
+            if set(driver.window_handles) - known_windows:
+                return True
+            return _clickable(driver, CONTINUE_BUTTON_SELECTOR) or False
+
+        return self.wait.until(condition)
+
+    def _handle_normal_apply(self, apply_button) -> str | None:
+        """Clicks through a normal application and returns the employer URL if successful."""
+        known_windows = set(self.driver.window_handles)
+        apply_button.click()
+        logger.info("Clicked normal apply button, looking for continue button.")
         try:
-            button = self.wait.until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-            )
-            logger.debug(f"Finded button with selector: {selector}")
-            button.click()
-            logger.debug(f"Clicked button with selector: {selector}")
-            return True
+            continue_button = self._wait_for_continue_or_window(known_windows)
         except TimeoutException:
-            logger.debug(f"Button with selector {selector} not found or not clickable.")
-            return False
-
-    def _handle_fast_apply(self) -> bool:
-        """Handles the fast apply process."""
-        if self._click_button(FAST_APPLY_SELECTOR):
-            logger.info("Clicked fast apply button.")
-            return True
-        return False
+            logger.warning("Neither a continue button nor a new window appeared.")
+            return None
+        if continue_button is not True:
+            continue_button.click()
+            logger.info("Clicked continue button.")
+        return self._get_new_window_url(known_windows)
 
-    def _handle_normal_apply(self) -> str | None:
-        """Handles the normal apply process and returns the new URL if successful."""
-        if self._click_button(NORMAL_APPLY_SELECTOR):
-            logger.info("Clicked normal apply button, looking for continue button.")
-            if self._click_button(CONTINUE_BUTTON_SELECTOR):
-                logger.info("Clicked continue button.")
-                return self._get_new_window_url()
-        return None
-
-    def _get_new_window_url(self) -> str | None:
-        """Switches to a new window and returns its URL."""
+    def _get_new_window_url(self, known_windows: set[str]) -> str | None:
+        """Switches to the window opened by the application and returns its URL."""
         original_window = self.driver.current_window_handle
         try:
-            self.wait.until(EC.number_of_windows_to_be(2))
-            new_window_handle = [
-                window
-                for window in self.driver.window_handles
-                if window != original_window
-            ][0]
+            new_window_handle = self.wait.until(
+                lambda driver: next(iter(set(driver.window_handles) - known_windows), False)
+            )
             self.driver.switch_to.window(new_window_handle)
             self.wait.until(EC.url_contains("https://"))
             new_url = self.driver.current_url
             logger.info(f"Switched to new tab with URL: {new_url}")
             return new_url
-        except (TimeoutException, IndexError):
+        except TimeoutException:
             logger.warning(
                 "No new window opened after clicking continue or URL did not change."
             )
             self.driver.switch_to.window(original_window)
             return None
 
-    def find_and_click_apply(self) -> str | None:
+    def find_and_click_apply(self) -> ClickResult:
         """
-        Finds and clicks the appropriate apply button.
-        Returns the new URL if a normal application is started, otherwise None.
+        Waits once for whichever apply button or page marker appears first and acts on it.
+        Carries the new URL if a normal application is started.
         """
-        if self._handle_fast_apply():
-            return None
+        try:
+            target, element = self.wait.until(first_apply_target())
+        except TimeoutException:
+            logger.warning("No apply buttons were found or could be clicked.")
+            return ClickResult(outcome=ClickOutcome.NOT_FOUND)
+
+        if target == ApplyTarget.EXPIRED:
+            logger.info("Offer has expired.")
+            return ClickResult(outcome=ClickOutcome.EXPIRED)
+        if target == ApplyTarget.ALREADY_APPLIED:
+            logger.info("Already applied to this offer.")
+            return ClickResult(outcome=ClickOutcome.ALREADY_APPLIED)
+        if target == ApplyTarget.FAST_APPLY:
+            element.click()
+            logger.info("Clicked fast apply button.")
+            return ClickResult(outcome=ClickOutcome.FAST_APPLIED)
 
-        new_url = self._handle_normal_apply()
+        new_url = self._handle_normal_apply(element)
         if new_url:
-            return new_url
+            return ClickResult(outcome=ClickOutcome.EXTERNAL, external_url=new_url)
+        return ClickResult(outcome=ClickOutcome.NOT_FOUND)
+
+
+class TabPipeline:
+    """
+    Opens each offer in its own tab of one driver and keeps up to `depth` upcoming offers
+    loading in background tabs while the current one is clicked through, hiding page-load
+    latency without starting more browsers.
+    """
+
+    def __init__(self, driver, wait, depth: int = PRELOAD_TABS):
+        self.driver = driver
+        self.wait = wait
+        self.depth = depth
+        self.main_window = driver.current_window_handle
+        self.pending: deque[tuple[str, str]] = deque()
 
-        logger.warning("No apply buttons were found or could be clicked.")
-        return None
+    def _open(self, url: str):
+        default_rate_limiter().acquire(urlsplit(url).hostname or "")
+        self.driver.switch_to.new_window("tab")
+        handle = self.driver.current_window_handle
+        # Navigating from a script returns at once, while driver.get would wait for the load.
+        self.driver.execute_script("window.location.href = arguments[0];", url)
+        self.pending.append((url, handle))
+
+    def _report_load(self, url: str):
+        """
+        Feeds the tab's own navigation timing to the rate limiter once its DOM is parsed.
+        A tab still on about:blank is complete at once with no timing, which would pass
+        for a very fast response, so only the document of the offer's host counts.
+        """
+        host = urlsplit(url).hostname or ""
+        try:
+            response_end = self.wait.until(
+                lambda driver: driver.execute_script(NAVIGATION_RESPONSE_END_JS, host)
+            )
+            throttled = is_throttled(None, self.driver.page_source)
+        except WebDriverException as e:
+            logger.debug(f"Couldnt read how {url} loaded, not reporting its latency: {e}")
+            return
+        default_rate_limiter().report(host, response_end / MILLISECONDS_PER_SECOND, throttled)
+
+    def close_finished_windows(self):
+        """Closes every window except the main one and the preloading tabs, e.g. employer pages."""
+        keep = {self.main_window, *(handle for _, handle in self.pending)}
+        for handle in self.driver.window_handles:
+            if handle not in keep:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+        self.driver.switch_to.window(self.main_window)
+
+    def iter_loaded(
+        self, work_queue: queue.Queue
+    ) -> Iterator[tuple[str, Optional[WebDriverException]]]:
+        """
+        Yields queued offer URLs with their tab in focus until the queue delivers None.
+        The tab is closed when the next URL is requested. An offer whose tab could not be
+        opened or focused is yielded with the error instead, and the pipeline goes on.
+        """
+        stream_open = True
+        while True:
+            while stream_open and len(self.pending) <= self.depth:
+                try:
+                    url = work_queue.get(block=not self.pending)
+                except queue.Empty:
+                    break
+                if url is None:
+                    stream_open = False
+                    continue
+                try:
+                    self._open(url)
+                except WebDriverException as e:
+                    yield url, e
+            if not self.pending:
+                return
+            url, handle = self.pending.popleft()
+            try:
+                self.driver.switch_to.window(handle)
+            except WebDriverException as e:
+                yield url, e
+                continue
+            self._report_load(url)
+            yield url, None
+            try:
+                self.close_finished_windows()
+            except WebDriverException as e:
+                logger.warning(f"Couldnt close the finished tabs: {e}")
 
 
 class Applier:
@@ -116,19 +343,26 @@ class Applier:
         self.driver = None
         self.wait = None
         self.offers = None
+        self.driver_pool = None
+        self.browser_pool = None
+        self.ledger = OfferLedger(config.username)
+        self.login = PracujLogin(
+            config.email, config.password, config.username, config.headless, config.browser
+        )
+        # Cookie jar shared by the scraping and classification sessions.
+        self.http_cookies = RequestsCookieJar()
+        self._login_executor = None
+        self._login_future = None
 
     @property
     def initialize_logged_in_driver(self):
         """Initializes and returns a logged-in Selenium WebDriver instance."""
         if not self.driver:
             try:
-                self.driver, self.wait = PracujLogin(
-                    self.config.email,
-                    self.config.password,
-                    self.config.username,
-                    self.config.headless,
-                    self.config.browser,
-                ).login()
+                self.driver, self.wait = self.login.login()
+                if not self.login.cookies_verified:
+                    # A fresh login also logs in the HTTP sessions from here on.
+                    add_cookies_to_jar(self.http_cookies, self.driver.get_cookies())
                 logger.debug("Driver initialized successfully!")
                 return self.driver, self.wait
             except Exception as e:
@@ -136,65 +370,312 @@ class Applier:
                 raise
         return self.driver, self.wait
 
-    @property
-    def get_offers(self):
-        """Scrapes and returns a list of job offer URLs."""
-        if not self.offers:
+    def _create_scraper_manager(self) -> ScraperManager:
+        known_offer_ids = (
+            self.ledger.finished_offer_ids() if self.config.incremental else None
+        )
+        return ScraperManager(
+            self.config.filtered_job_url,
+            headless=self.config.headless,
+            browser=self.config.browser,
+            known_offer_ids=known_offer_ids,
+            overlap_pages=self.config.incremental_overlap_pages,
+            cookies=self.http_cookies,
+        )
+
+    def _iter_new_offers(self, offer_urls: Iterable[str]) -> Iterator[str]:
+        """Records each scraped offer and yields only those the ledger has not finished yet."""
+        self.offers = []
+        skipped = 0
+        for url in offer_urls:
+            self.offers.append(url)
+            offer_id = self.ledger.record_scraped(url)
+            if self.ledger.is_done(offer_id):
+                skipped += 1
+                continue
+            yield url
+        logger.info(f"Skipped {skipped} offers already handled in previous runs.")
+
+    def _iter_classified(self, offer_urls: Iterable[str]) -> Iterator[OfferClassification]:
+        if not self.config.classify_over_http:
+            return (
+                OfferClassification(url=url, verdict=OfferVerdict.UNKNOWN)
+                for url in offer_urls
+            )
+        return OfferClassifier(
+            session=create_http_session(cookies=self.http_cookies)
+        ).iter_classified(offer_urls)
+
+    def _record_classification(self, classification: OfferClassification):
+        offer_id = canonical_offer_id(classification.url)
+        if classification.verdict in SKIPPED_VERDICTS:
+            logger.info(f"Skipping {classification.url}: {classification.verdict.value}")
+            self.ledger.set_state(
+                offer_id, OfferState.SKIPPED, error=classification.verdict.value
+            )
+        elif not classification.needs_driver:
+            logger.info(f"Found external application URL: {classification.external_url}")
+            self.ledger.set_state(
+                offer_id,
+                OfferState.EXTERNAL_QUEUED,
+                external_url=classification.external_url,
+            )
+        else:
+            self.ledger.set_state(offer_id, OfferState.CLASSIFIED)
+
+    def _begin_login(self) -> Future:
+        """Starts the browser login in the background, once."""
+        if self._login_future is None:
+            self._login_future = self._login_executor.submit(
+                lambda: self.initialize_logged_in_driver
+            )
+        return self._login_future
+
+    def _start_click_drivers(self) -> list[tuple]:
+        """
+        Waits for the login and, when `apply_drivers` asks for more than one driver,
+        clones the session into extra drivers. The cookies are exported through the
+        CookieManager first, so the saved session is as fresh as the one being cloned.
+        """
+        self.driver, self.wait = self._begin_login().result()
+        self.driver_pool = DriverPool(
+            (self.driver, self.wait),
+            headless=self.config.headless,
+            browser=self.config.browser,
+        )
+        if self.config.apply_drivers > 1:
+            cookies = self.driver.get_cookies()
+            CookieManager(self.config.username).save_cookies(cookies)
+            self.driver_pool.grow(self.config.apply_drivers, cookies)
+        return self.driver_pool.drivers
+
+    def _on_session_renewed(self, cookies: list[dict]):
+        # Drivers started later load the saved cookies, which are already the renewed ones.
+        if self.driver_pool:
+            self.driver_pool.renew_session(cookies)
+
+    def _run_click_worker(self, driver, wait, work_queue: queue.Queue):
+        """Clicks through queued offer URLs on one driver until it receives None."""
+        tabs = TabPipeline(driver, wait, depth=self.config.preload_tabs)
+        for url, error in tabs.iter_loaded(work_queue):
+            offer_id = canonical_offer_id(url)
+            if error is None:
+                try:
+                    self.driver_pool.reseed_if_stale(driver, tabs.main_window)
+                    result = ClickApply(driver, wait).find_and_click_apply()
+                except Exception as e:
+                    error = e
+            if error is not None:
+                logger.error(f"Couldnt click through {url}: {error}")
+                self.ledger.set_state(offer_id, OfferState.FAILED, error=str(error))
+                continue
+            self._record_click_result(offer_id, result)
+            if result.outcome == ClickOutcome.EXTERNAL:
+                logger.info(f"Found external application URL: {result.external_url}")
+
+    @staticmethod
+    def _put_while_workers_alive(work_queue: queue.Queue, item, workers: list[Future]) -> bool:
+        """Blocks on a full queue while any worker runs; False once all of them stopped."""
+        while True:
             try:
-                self.offers = ScraperManager(self.config.filtered_job_url).run_scraper()
-                logger.debug("Offers's urls succesfully scraped")
-                return self.offers
-            except Exception as e:
-                logger.error(f"Couldnt scrape offers's urls: {e}")
-                raise
-        return self.offers
+                work_queue.put(item, timeout=WORK_QUEUE_POLL_SECONDS)
+                return True
+            except queue.Full:
+                if all(worker.done() for worker in workers):
+                    return False
 
-    def apply(self):
-        """Main method to start the application process."""
-        self.offers = self.get_offers
-        self.driver, self.wait = self.initialize_logged_in_driver
-        main_window = self.driver.current_window_handle
-
-        external_job_urls = []
-        for url in self.offers:
-            self.driver.get(url)
-            clicker = ClickApply(self.driver, self.wait)
-            new_url = clicker.find_and_click_apply()
-            if new_url:
-                logger.info(f"Found external application URL: {new_url}")
-                external_job_urls.append(new_url)
-                self.driver.close()
-                self.driver.switch_to.window(main_window)
+    def _apply_to_offers(self, offer_urls: Iterable[str]) -> list[str]:
+        """
+        Classifies offers over HTTP as they arrive and clicks through only those that need
+        the logged-in driver. Those offers go through a work queue shared by
+        `apply_drivers` drivers. Offers the ledger already finished are skipped, and each
+        outcome is recorded so an interrupted run resumes where it stopped.
+        """
+        work_queue = queue.Queue()
+        executor = None
+        workers: list[Future] = []
+        try:
+            for classification in self._iter_classified(self._iter_new_offers(offer_urls)):
+                self._record_classification(classification)
+                if not classification.needs_driver:
+                    continue
+                if executor is None:
+                    drivers = self._start_click_drivers()
+                    work_queue = queue.Queue(maxsize=len(drivers) * WORK_QUEUE_SIZE_PER_DRIVER)
+                    executor = ThreadPoolExecutor(max_workers=len(drivers))
+                    workers = [
+                        executor.submit(self._run_click_worker, driver, wait, work_queue)
+                        for driver, wait in drivers
+                    ]
+                if not self._put_while_workers_alive(work_queue, classification.url, workers):
+                    # Surfaces the error that stopped the last worker.
+                    for worker in workers:
+                        worker.result()
+                    raise RuntimeError("All click workers stopped.")
+        finally:
+            # Never raises, so an error from the loop above reaches the caller unchanged.
+            if executor is not None:
+                for worker in workers:
+                    if not worker.done() and not self._put_while_workers_alive(
+                        work_queue, None, workers
+                    ):
+                        break
+                executor.shutdown(wait=True)
+        for worker in workers:
+            worker.result()
+        return self.ledger.pending_external_urls()
 
-        if external_job_urls and self.config.apply_with_ai:
-            logger.info(f"Found {len(external_job_urls)} external job applications.")
-            self.apply_with_browser_agent(external_job_urls)
+    def _record_click_result(self, offer_id: str, result: ClickResult):
+        if result.outcome == ClickOutcome.FAST_APPLIED:
+            self.ledger.set_state(offer_id, OfferState.FAST_APPLIED)
+        elif result.outcome == ClickOutcome.EXTERNAL:
+            self.ledger.set_state(
+                offer_id, OfferState.EXTERNAL_QUEUED, external_url=result.external_url
+            )
+        elif result.outcome in (ClickOutcome.EXPIRED, ClickOutcome.ALREADY_APPLIED):
+            self.ledger.set_state(offer_id, OfferState.SKIPPED, error=result.outcome.value)
         else:
-            logger.info(
-                "No external job applications found to process, or you didnt choose apply_with_ai"
+            self.ledger.set_state(
+                offer_id, OfferState.FAILED, error="No apply button found"
             )
 
-    def _apply_job_for_url(self, url: str):
-        """Helper to apply job in separate process with error handling."""
-        logger.info(f"Starting job application for URL: {url}")
+    def apply(self, offer_urls: Optional[Iterable[str]] = None):
+        """Main method to start the application process."""
+        refresher = SessionRefresher(
+            self.login, self.http_cookies, on_renewed=self._on_session_renewed
+        )
+        try:
+            with ThreadPoolExecutor(max_workers=1) as self._login_executor:
+                if self.login.check_session_over_http(
+                    create_http_session(cookies=self.http_cookies)
+                ):
+                    refresher.start()
+                else:
+                    # Refreshing before this login finishes would start a second one.
+                    def start_refresher(login: Future):
+                        if login.exception() is None:
+                            refresher.start()
+
+                    self._begin_login().add_done_callback(start_refresher)
+                try:
+                    offer_stream = (
+                        offer_urls
+                        if offer_urls is not None
+                        else self._create_scraper_manager().iter_offers()
+                    )
+                    external_job_urls = self._apply_to_offers(offer_stream)
+                except Exception as e:
+                    logger.error(f"Couldnt scrape or apply to offers: {e}")
+                    raise
+            logger.info(f"Processed {len(self.offers)} offers. Ledger: {self.ledger.summary()}")
+            logger.info(f"HTTP cache: {default_http_cache().stats.summary()}")
+
+            if external_job_urls and self.config.apply_with_ai:
+                logger.info(f"Found {len(external_job_urls)} external job applications.")
+                self.apply_with_browser_agent(external_job_urls)
+            else:
+                logger.info(
+                    "No external job applications found to process, or you didnt choose apply_with_ai"
+                )
+        finally:
+            refresher.stop()
+
+    def close(self):
+        """Quits the logged-in drivers, if any were started."""
+        if self.driver_pool:
+            self.driver_pool.close()
+            self.driver_pool = None
+        if self.driver:
+            self.driver.quit()
+            self.driver = None
+            self.wait = None
+
+    def _create_job_applier(self, url: str) -> JobApplier:
+        return JobApplier(
+            username=self.config.username,
+            initial_url=url,
+            model_name=self.config.model_name,
+            base_url=self.config.base_url,
+            provider=self.config.provider,
+            api_key=self.config.api_key,
+            headless=self.config.headless,
+            use_templates=self.config.replay_templates,
+            compact_cv=self.config.compact_cv,
+            max_steps=self.config.agent_max_steps,
+            timeout_seconds=self.config.agent_timeout_seconds,
+            profile=get_agent_profile(self.config.agent_profile),
+            llm_limits=LlmLimits(
+                requests_per_minute=self.config.llm_requests_per_minute,
+                tokens_per_minute=self.config.llm_tokens_per_minute,
+            ),
+        )
+
+    async def _run_job_applier(self, url: str) -> AgentRunReport:
+        job_applier = self._create_job_applier(url)
+        async with self.browser_pool.session() as browser_session:
+            applied = await job_applier.run(browser_session)
+        return AgentRunReport(
+            applied=applied,
+            error=job_applier.stop_reason,
+            prompt_tokens=job_applier.prompt_tokens,
+            completion_tokens=job_applier.completion_tokens,
+        )
+
+    async def _run_agents(
+        self, scheduler: AgentScheduler, external_job_urls: list[str]
+    ) -> list[AgentJobResult]:
+        """Runs the scheduled agents on browsers shared through one session pool."""
+        profile = get_agent_profile(self.config.agent_profile)
+        self.browser_pool = BrowserSessionPool(
+            scheduler.max_concurrency, **profile.session_settings(self.config.headless)
+        )
         try:
-            job_applier = JobApplier(
-                username=self.config.username,
-                initial_url=url,
-                model_name=self.config.model_name,
-                base_url=self.config.base_url,
-                provider=self.config.provider,
-                api_key=self.config.api_key,
+            return await scheduler.run(external_job_urls)
+        finally:
+            await self.browser_pool.close()
+            self.browser_pool = None
+            await default_llm_registry().aclose()
+
+    def _record_agent_result(self, result: AgentJobResult):
+        # Cancelled jobs stay queued, so the next run picks them up again.
+        if result.status == AgentJobStatus.APPLIED:
+            self.ledger.set_state_by_external_url(result.url, OfferState.AGENT_APPLIED)
+        elif result.status != AgentJobStatus.CANCELLED:
+            self.ledger.set_state_by_external_url(
+                result.url, OfferState.FAILED, error=result.error
             )
-            job_applier.run()
-            logger.info(f"Successfully finished application for URL: {url}")
-        except Exception as e:
-            logger.error(f"An error occurred while applying for {url}: {e}")
-
-    def apply_with_browser_agent(self, external_job_urls: list[str]):
-        num_processes = multiprocessing.cpu_count() - 1
-        if num_processes < 1:
-            num_processes = 1
-        logger.debug(f"Starting multiprocessing with {num_processes} processes for job applications.")
-        with multiprocessing.Pool(processes=num_processes) as pool:
-            pool.map(self._apply_job_for_url, external_job_urls)
+
+    def apply_with_browser_agent(self, external_job_urls: list[str]) -> list[AgentJobResult]:
+        """Runs the browser agents for external applications concurrently in one event loop."""
+        scheduler = AgentScheduler(
+            self._run_job_applier,
+            max_concurrency=agent_concurrency(
+                self.config.agent_concurrency, self.config.llm_requests_per_minute
+            ),
+            job_timeout=self.config.agent_timeout_seconds + AGENT_STOP_GRACE_SECONDS,
+            on_result=self._record_agent_result,
+        )
+        logger.debug(
+            f"Running {len(external_job_urls)} job applications, "
+            f"{scheduler.max_concurrency} at a time."
+        )
+        results = asyncio.run(self._run_agents(scheduler, external_job_urls))
+        outcomes: dict[str, int] = {}
+        for result in results:
+            outcomes[result.status.value] = outcomes.get(result.status.value, 0) + 1
+        logger.info(f"Agent applications: {outcomes}")
+        # Per-application averages, comparable between agent profiles.
+        finished = max(1, len(results))
+        prompt_tokens = sum(result.prompt_tokens for result in results)
+        completion_tokens = sum(result.completion_tokens for result in results)
+        duration = sum(result.duration for result in results)
+        logger.info(
+            f"Agent profile '{self.config.agent_profile}': {prompt_tokens} prompt and "
+            f"{completion_tokens} completion tokens, "
+            f"{(prompt_tokens + completion_tokens) // finished} tokens and "
+            f"{duration / finished:.0f}s per application"
+        )
+        logger.info(
+            f"Answer cache: {default_answer_cache(self.config.username).stats.summary()}"
+        )
+        return results
@@ -0,0 +1,97 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+from urllib.parse import urlsplit
+
+from browser_use.browser import BrowserSession
+
+from src.logger import SingletonLogger
+
+logger = SingletonLogger().get_logger()
+
+
+def _origin(url: str) -> str | None:
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https"):
+        return None
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class BrowserSessionPool:
+    """
+    Long-lived browser_use sessions lent to one agent at a time.
+    Browsers are started lazily, up to `size`, and kept alive between applications.
+    Before a session is lent again its cookies, the storage of the sites it visited and
+    all of its tabs are cleared, so no application sees another one's state.
+    Extra `session_settings` are passed on to every BrowserSession.
+    """
+
+    def __init__(self, size: int, headless: bool = True, **session_settings):
+        self.size = size
+        self.headless = headless
+        self.session_settings = session_settings
+        self._sessions: list[BrowserSession] = []
+        self._idle: asyncio.Queue[BrowserSession | None] = asyncio.Queue()
+        self._started = 0
+
+    async def _start_session(self) -> BrowserSession:
+        session = BrowserSession(
+            headless=self.headless, keep_alive=True, **self.session_settings
+        )
+        await session.start()
+        self._sessions.append(session)
+        logger.debug(f"Started browser session {len(self._sessions)}/{self.size}.")
+        return session
+
+    async def _acquire(self) -> BrowserSession:
+        # None in the idle queue is a free slot left by a discarded session.
+        if self._idle.empty() and self._started < self.size:
+            self._started += 1
+            session = None
+        else:
+            session = await self._idle.get()
+        if session is not None:
+            return session
+        try:
+            return await self._start_session()
+        except BaseException:
+            self._idle.put_nowait(None)
+            raise
+
+    async def _reset(self, session: BrowserSession):
+        tabs = await session.get_tabs()
+        await session.clear_cookies()
+        for origin in {_origin(tab.url) for tab in tabs} - {None}:
+            await session.cdp_client.send.Storage.clearDataForOrigin(
+                params={"origin": origin, "storageTypes": "all"}
+            )
+        # A blank tab is opened first, since closing the last tab would close the browser.
+        await session.new_page()
+        for tab in tabs:
+            await session.close_page(tab.target_id)
+
+    async def _discard(self, session: BrowserSession):
+        self._sessions.remove(session)
+        self._idle.put_nowait(None)
+        try:
+            await session.kill()
+        except Exception as e:
+            logger.debug(f"Couldnt kill browser session: {e}")
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[BrowserSession]:
+        """Lends an isolated browser session for the duration of one application."""
+        session = await self._acquire()
+        try:
+            yield session
+        finally:
+            try:
+                await self._reset(session)
+                self._idle.put_nowait(session)
+            except Exception as e:
+                logger.warning(f"Browser session could not be reset, replacing it: {e}")
+                await self._discard(session)
+
+    async def close(self):
+        for session in list(self._sessions):
+            await self._discard(session)
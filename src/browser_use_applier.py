@@ -1,21 +1,17 @@
+import time
 from pathlib import Path
+from typing import Optional
 
 from dotenv import load_dotenv
-from PyPDF2 import PdfReader 
-
-from browser_use import (
-    ActionResult,
-    Agent,
-    ChatOpenAI,
-    Tools,
-    ChatAnthropic,
-    ChatAzureOpenAI,
-    ChatGoogle,
-    ChatGroq,
-    ChatOllama,
-)
+
+from browser_use import ActionResult, Agent, Tools
 from browser_use.browser import BrowserSession
 from browser_use.browser.events import UploadFileEvent
+from src.agent_profiles import AGENT_PROFILES, DEFAULT_PROFILE, AgentProfile
+from src.answer_cache import default_answer_cache
+from src.cv_cache import CvProfile, build_digest, default_cv_cache
+from src.agent_templates import TemplateStore, form_fingerprint
+from src.llm_pool import LlmLimits, default_llm_registry
 from src.logger import SingletonLogger
 
 load_dotenv()
@@ -25,6 +21,12 @@ logger = SingletonLogger().get_logger()
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 CV_PATH = BASE_DIR / "data" / "CV"
+TEMPLATE_REPLAY_RETRIES = 1
+DEFAULT_MAX_STEPS = 40
+# The agent is nudged after 5 repeats of an action; a run that keeps repeating it on an
+# unchanged page after that is stopped.
+LOOP_REPEATED_ACTIONS = 8
+LOOP_STAGNANT_STEPS = 5
 
 
 class JobApplier:
@@ -41,6 +43,13 @@ class JobApplier:
         provider: str,
         api_key: str,
         base_url: str,
+        headless: bool = True,
+        use_templates: bool = True,
+        compact_cv: bool = True,
+        llm_limits: Optional[LlmLimits] = None,
+        max_steps: int = DEFAULT_MAX_STEPS,
+        timeout_seconds: Optional[float] = None,
+        profile: AgentProfile = AGENT_PROFILES[DEFAULT_PROFILE],
     ):
         """
         Initializes the JobApplier.
@@ -51,6 +60,16 @@ class JobApplier:
             model_name (str): The name of the language model to use.
             api_key (str): The API key for the language model.
             base_url (str): The base URL for the language model API.
+            headless (bool): Whether a browser started by `run` is headless.
+            use_templates (bool): Whether to replay and record per-ATS action templates.
+            compact_cv (bool): Whether the agent keeps only a CV digest in memory and reads
+                full sections on demand.
+            llm_limits (LlmLimits): Requests and tokens per minute allowed for the model,
+                shared by all agents in the process.
+            max_steps (int): Agent steps allowed for one application.
+            timeout_seconds (float): Wall-clock time after which the agent is stopped at its
+                next step.
+            profile (AgentProfile): Vision, DOM and browser settings of the agent.
         """
         self.username = username
         self.initial_url = initial_url
@@ -58,42 +77,82 @@ class JobApplier:
         self.provider = provider
         self.api_key = api_key
         self.base_url = base_url
+        self.headless = headless
+        self.use_templates = use_templates
+        self.compact_cv = compact_cv
+        self.llm_limits = llm_limits
+        self.max_steps = max_steps
+        self.timeout_seconds = timeout_seconds
+        self.profile = profile
+        self.stop_reason: Optional[str] = None
+        self._deadline: Optional[float] = None
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.templates = TemplateStore(username)
+        self.answers = default_answer_cache(username)
         self.cv_path = CV_PATH
         self.tools = self._register_tools()
 
-    def load_cv(self) -> str:
+    def load_cv_profile(self) -> Optional[CvProfile]:
         """
-        Loads a CV from the given path and returns its text content.
+        Returns the parsed CV of the user, from the CV cache when the PDF is unchanged.
         The path is expected to be a directory, and the filename is constructed using the username.
         """
         full_path = self.cv_path / f"{self.username}.pdf"
-        logger.info(f"Attempting to load CV from {full_path}")
         try:
-            pdf = PdfReader(full_path)
-            text = "".join(page.extract_text() or "" for page in pdf.pages)
-            logger.info(f"Loaded CV with {len(text)} characters")
-            return text
+            return default_cv_cache().load(full_path)
         except FileNotFoundError:
             logger.error(f"CV file not found: {full_path}")
-            return ""
+            return None
         except Exception as e:
             logger.error(f"Error reading CV at {full_path}: {e}")
-            return ""
+            return None
+
+    def load_cv(self) -> str:
+        """Returns the full text content of the user's CV."""
+        profile = self.load_cv_profile()
+        return profile.text if profile else ""
 
     def _register_tools(self) -> Tools:
         """Registers the tools for the browser agent."""
         tools = Tools()
 
-        @tools.action("Read my cv for context to fill forms")
-        def read_cv():
-            """Reads the user's CV and returns its text content."""
-            text = self.load_cv()
-            if not text:
+        default_section = "overview" if self.compact_cv else "all"
+
+        @tools.action(
+            "Read my cv for context to fill forms. Pass a section (contacts, summary, "
+            "experience, education, skills, languages, courses, projects) to read only "
+            f"that part, 'overview' for a short digest, or 'all' for the whole CV "
+            f"(default: {default_section})"
+        )
+        def read_cv(section: str = default_section):
+            """Returns the requested section of the user's CV, its digest, or its whole text."""
+            profile = self.load_cv_profile()
+            if profile is None or not profile.text:
                 return ActionResult(
                     error=f"Could not load CV for username {self.username} from {self.cv_path}"
                 )
+            if section == "overview":
+                # The digest is small enough to stay in memory for the rest of the run.
+                digest = profile.digest or build_digest(profile)
+                return ActionResult(extracted_content=digest, include_in_memory=True)
 
-            return ActionResult(extracted_content=text, include_in_memory=True)
+            content = profile.text if section == "all" else profile.section(section)
+            if not content:
+                available = ", ".join(["contacts", *profile.sections])
+                return ActionResult(
+                    extracted_content=(
+                        f"No '{section}' section in the CV. Available: {available}, overview, all"
+                    )
+                )
+            if self.compact_cv:
+                # Full sections are shown once and not carried through every later step.
+                return ActionResult(
+                    extracted_content=content,
+                    include_extracted_content_only_once=True,
+                    long_term_memory=f"Read the '{section}' section of the CV.",
+                )
+            return ActionResult(extracted_content=content, include_in_memory=True)
 
         @tools.action(
             "Upload cv to element - call this function to upload if element is not found, try with different index of the same upload element",
@@ -127,52 +186,150 @@ class JobApplier:
                 logger.debug(f"Error in upload: {str(e)}")
                 return ActionResult(error=f"Failed to upload file to index {index}")
 
-        return tools
+        @tools.action(
+            "Look up my saved answers to application form questions (salary expectation, "
+            "notice period, availability, consents, language level...) - call this with all "
+            "questions of the form before answering them yourself",
+        )
+        def lookup_answers(questions: list[str]):
+            """Returns the cached answers of the given questions, and which ones are unknown."""
+            known, unknown = [], []
+            for question in questions:
+                answer = self.answers.lookup(question)
+                if answer is None:
+                    unknown.append(question)
+                else:
+                    known.append(f"{question}: {answer}")
+            lines = ["Saved answers:", *known] if known else ["No saved answers."]
+            if unknown:
+                lines += ["No saved answer for:", *unknown]
+            return ActionResult(extracted_content="\n".join(lines), include_in_memory=True)
 
-    def construct_proper_model_call(self):
-        provider_map = {
-            "OpenAI": ChatOpenAI,
-            "Anthropic": ChatAnthropic,
-            "AzureOpenAI": ChatAzureOpenAI,
-            "Google": ChatGoogle,
-            "Groq": ChatGroq,
-            "Ollama": ChatOllama,
-            "OpenAI_compatible": ChatOpenAI,
-        }
+        @tools.action(
+            "Save the answer you gave to a recurring application form question so later "
+            "applications can reuse it",
+        )
+        def save_answer(question: str, answer: str):
+            """Stores the answer to a form question in the user's answer cache."""
+            self.answers.save(question, answer)
+            return ActionResult(extracted_content=f"Saved answer to '{question}'")
 
-        try:
-            model_class = provider_map[self.provider]
-            if self.provider == "OpenAI_compatible":
-                model = model_class(
-                    model=self.model_name, base_url=self.base_url, api_key=self.api_key
-                )
-                return model
-            model = model_class(model=self.model_name)
-            return model
-        except KeyError:
-            raise ValueError(f"Unsupported provider: {self.provider}")
+        return tools
 
-    async def run(self):
-        """Runs the job application agent."""
-        browser_session = BrowserSession(headless=False)
+    def construct_proper_model_call(self):
+        """Model for this agent, sharing connections and rate limits with the other agents."""
+        return default_llm_registry().chat_model(
+            self.provider,
+            self.model_name,
+            base_url=self.base_url,
+            api_key=self.api_key,
+            limits=self.llm_limits,
+        )
 
-        initial_actions = [{"go_to_url": {"url": self.initial_url}}]
+    def _create_agent(self, browser_session: BrowserSession, **kwargs) -> Agent:
         ground_task = (
             "You are a professional job applier. "
             "On the current url, find how to apply. "
-            "1. Read my cv with read_cv. "
-            "2. Fill the form based on the CV."
+            "1. Read my cv with read_cv, and the full sections the form asks about when needed. "
+            "2. Look up saved answers to the form questions with lookup_answers. "
+            "3. Fill the form based on the saved answers and the CV, and save answers to "
+            "recurring questions that had none with save_answer. "
             "Important: If you dont have info to fill something you can just make it up"
         )
-
-        model = self.construct_proper_model_call()
-
-        agent = Agent(
+        return Agent(
             task=ground_task,
-            llm=model,
+            llm=self.construct_proper_model_call(),
             tools=self.tools,
             browser_session=browser_session,
-            initial_actions=initial_actions,
+            **self.profile.agent_settings(),
+            **kwargs,
         )
 
-        await agent.run()
+    async def _add_usage(self, agent: Agent):
+        usage = await agent.token_cost_service.get_usage_summary()
+        self.prompt_tokens += usage.total_prompt_tokens
+        self.completion_tokens += usage.total_completion_tokens
+
+    async def _check_progress(self, agent: Agent):
+        """Step hook that stops the agent past its deadline or when it is stuck in a loop."""
+        detector = agent.state.loop_detector
+        if self._deadline is not None and time.monotonic() > self._deadline:
+            self.stop_reason = f"Deadline of {self.timeout_seconds:.0f}s exceeded"
+        elif (
+            detector.max_repetition_count >= LOOP_REPEATED_ACTIONS
+            and detector.consecutive_stagnant_pages >= LOOP_STAGNANT_STEPS
+        ):
+            self.stop_reason = (
+                f"Stuck repeating an action {detector.max_repetition_count} times "
+                f"on a page unchanged for {detector.consecutive_stagnant_pages} steps"
+            )
+        else:
+            return
+        logger.info(f"Stopping agent for {self.initial_url}: {self.stop_reason}")
+        agent.stop()
+
+    async def _replay_template(
+        self, browser_session: BrowserSession
+    ) -> tuple[bool, Optional[str]]:
+        """
+        Opens the application page and replays the stored template of its form, if any.
+        Returns whether the replay finished the application, and the form fingerprint,
+        which is None when there is no form to match a template against.
+        """
+        try:
+            await browser_session.start()
+            await browser_session.navigate_to(self.initial_url)
+            fingerprint = await form_fingerprint(browser_session)
+        except Exception as e:
+            logger.debug(f"Couldnt fingerprint the application form: {e}")
+            return False, None
+        if fingerprint is None:
+            logger.debug(f"No form fields on {self.initial_url}, not using templates.")
+            return False, None
+        template = self.templates.find(self.initial_url, fingerprint)
+        if template is None:
+            return False, fingerprint
+
+        logger.info(f"Replaying application template {template}")
+        agent = self._create_agent(browser_session)
+        try:
+            await agent.load_and_rerun(
+                template, skip_failures=False, max_retries=TEMPLATE_REPLAY_RETRIES
+            )
+        except Exception as e:
+            logger.info(f"Template replay diverged, handing over to the agent: {e}")
+            self.templates.discard(self.initial_url, fingerprint)
+            return False, fingerprint
+        finally:
+            await self._add_usage(agent)
+        logger.info(f"Applied to {self.initial_url} by replaying a template.")
+        return True, fingerprint
+
+    async def run(self, browser_session: Optional[BrowserSession] = None) -> bool:
+        """Runs the job application agent and returns whether it finished successfully."""
+        if browser_session is None:
+            browser_session = BrowserSession(**self.profile.session_settings(self.headless))
+        if self.timeout_seconds is not None:
+            self._deadline = time.monotonic() + self.timeout_seconds
+
+        fingerprint = None
+        if self.use_templates:
+            replayed, fingerprint = await self._replay_template(browser_session)
+            if replayed:
+                return True
+
+        initial_actions = [{"go_to_url": {"url": self.initial_url}}]
+        agent = self._create_agent(browser_session, initial_actions=initial_actions)
+        try:
+            history = await agent.run(max_steps=self.max_steps, on_step_end=self._check_progress)
+        finally:
+            await self._add_usage(agent)
+        applied = history.is_done() and history.is_successful() is not False
+        if not history.is_done() and self.stop_reason is None:
+            if agent.state.n_steps > self.max_steps:
+                self.stop_reason = f"Step budget of {self.max_steps} exhausted"
+            else:
+                self.stop_reason = next((e for e in reversed(history.errors()) if e), None)
+        if applied and fingerprint is not None:
+            self.templates.save(agent, self.initial_url, fingerprint)
+        return applied
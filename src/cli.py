@@ -1,6 +1,7 @@
 import questionary
 from typing import Dict
 from src.applier import ApplierConfig
+from src.agent_profiles import AGENT_PROFILES, DEFAULT_PROFILE
 import json
 from pathlib import Path
 from src.filter_url import get_filtered_pracuj_url
@@ -111,8 +112,20 @@ def collect_config_interactive() -> ApplierConfig:
     browser = questionary.select(
         "Select browser:", choices=["firefox", "chrome"], default="firefox"
     ).ask()
+    incremental = questionary.confirm(
+        "Only fetch new offers on later runs? (filters must sort newest first)",
+        default=False,
+    ).ask()
+    apply_drivers = int(
+        questionary.text(
+            "How many browsers should click through offers in parallel?",
+            default="1",
+            validate=lambda value: value.isdigit() and int(value) >= 1,
+        ).ask()
+    )
     
     model_name, provider, base_url, api_key = None , None , None , None 
+    agent_profile = DEFAULT_PROFILE
 
     if apply_with_ai:
         model_name = questionary.text("Enter model name:").ask()
@@ -135,6 +148,11 @@ def collect_config_interactive() -> ApplierConfig:
             api_key = questionary.text(
                 "Enter API key (required for OpenAI compatible):"
             ).ask()
+        agent_profile = questionary.select(
+            "Select agent profile (fast: no screenshots, form fields only, headless):",
+            choices=list(AGENT_PROFILES),
+            default=DEFAULT_PROFILE,
+        ).ask()
 
     print("\n--- ATTENTION ---")
     print("Please manually apply the desired filters on the page that just opened.")
@@ -154,10 +172,13 @@ def collect_config_interactive() -> ApplierConfig:
         apply_with_ai=apply_with_ai,
         headless=headless,
         browser=browser,
+        incremental=incremental,
+        apply_drivers=apply_drivers,
         model_name=model_name,
         base_url=base_url,
         provider=provider,
         api_key=api_key,
+        agent_profile=agent_profile,
     )
 
     save_config_for_user(username, new_config, CONFIG_FILE)
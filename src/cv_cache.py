@@ -0,0 +1,217 @@
+import hashlib
+import re
+import threading
+from pathlib import Path
+from typing import Optional
+
+from pydantic import BaseModel
+from PyPDF2 import PdfReader
+
+from src.logger import SingletonLogger
+from src.storage import atomic_write_text
+
+# --- Constants ---
+BASE_DIR = Path(__file__).resolve().parent.parent
+CV_CACHE_DIR = BASE_DIR / "data" / "cv_cache"
+# Heading keywords (English and Polish) that start each CV section, matched on whole lines.
+SECTION_HEADINGS = {
+    "summary": ("summary", "profile", "about me", "o mnie", "podsumowanie", "profil"),
+    "experience": (
+        "experience",
+        "work experience",
+        "employment history",
+        "doświadczenie",
+        "doświadczenie zawodowe",
+        "historia zatrudnienia",
+    ),
+    "education": ("education", "wykształcenie", "edukacja"),
+    "skills": ("skills", "technical skills", "umiejętności", "kompetencje"),
+    "languages": ("languages", "języki", "języki obce"),
+    "courses": ("courses", "certificates", "certifications", "kursy", "certyfikaty", "szkolenia"),
+    "projects": ("projects", "projekty"),
+    "interests": ("interests", "hobby", "zainteresowania"),
+}
+MAX_HEADING_LENGTH = 40
+DIGEST_TOKEN_BUDGET = 400
+# Rough size of a token for budgeting purposes, without depending on a tokenizer.
+CHARS_PER_TOKEN = 4
+# Sections in the order the digest keeps them when the budget runs out.
+DIGEST_SECTIONS = (
+    "header",
+    "contacts",
+    "summary",
+    "skills",
+    "languages",
+    "experience",
+    "education",
+    "courses",
+    "projects",
+)
+EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+PHONE_PATTERN = re.compile(r"\+?\d[\d \-()]{7,}\d")
+MIN_PHONE_DIGITS = 9
+URL_PATTERN = re.compile(r"(?:https?://)?(?:www\.)?(?:linkedin\.com|github\.com)/\S+")
+
+logger = SingletonLogger().get_logger()
+
+
+class CvProfile(BaseModel):
+    """Text of a CV split into the sections an application form usually asks about."""
+
+    source_hash: str
+    source_mtime: float
+    source_size: int
+    text: str
+    contacts: dict[str, list[str]] = {}
+    sections: dict[str, str] = {}
+    digest: str = ""
+
+    def section(self, name: str) -> Optional[str]:
+        """Full text of one section; `contacts` is rendered from the extracted contacts."""
+        if name == "contacts":
+            return "\n".join(
+                f"{kind}: {', '.join(values)}" for kind, values in self.contacts.items() if values
+            )
+        return self.sections.get(name)
+
+
+def _truncate_lines(text: str, max_chars: int) -> str:
+    kept, used = [], 0
+    for line in (line.strip() for line in text.splitlines()):
+        if not line:
+            continue
+        if used + len(line) > max_chars:
+            if not kept:
+                # A single long line (a summary paragraph) is cut at a word boundary.
+                kept.append(line[:max_chars].rsplit(" ", 1)[0] + " ...")
+            break
+        kept.append(line)
+        used += len(line) + 1
+    return "\n".join(kept)
+
+
+def build_digest(profile: CvProfile, token_budget: int = DIGEST_TOKEN_BUDGET) -> str:
+    """
+    Compact overview of the CV within roughly `token_budget` tokens. Sections share the
+    budget in priority order, keep their first lines, and pass what they leave unused on
+    to the next ones. The full sections stay available by name.
+    """
+    present = [name for name in DIGEST_SECTIONS if profile.section(name)]
+    remaining_chars = token_budget * CHARS_PER_TOKEN
+    parts = []
+    for index, name in enumerate(present):
+        share = remaining_chars // (len(present) - index)
+        excerpt = _truncate_lines(profile.section(name), share)
+        if excerpt:
+            parts.append(f"[{name}]\n{excerpt}")
+            remaining_chars -= len(excerpt)
+    return "\n".join(parts)
+
+
+def _heading_of(line: str) -> Optional[str]:
+    normalized = line.strip().strip(":").lower()
+    if not normalized or len(normalized) > MAX_HEADING_LENGTH:
+        return None
+    for section, headings in SECTION_HEADINGS.items():
+        if normalized in headings:
+            return section
+    return None
+
+
+def build_profile(text: str, source_hash: str, mtime: float, size: int) -> CvProfile:
+    """Splits CV text into sections by their headings; text before the first heading is the header."""
+    sections: dict[str, list[str]] = {"header": []}
+    current = "header"
+    for line in text.splitlines():
+        heading = _heading_of(line)
+        if heading is not None:
+            current = heading
+            sections.setdefault(current, [])
+            continue
+        sections[current].append(line)
+    profile = CvProfile(
+        source_hash=source_hash,
+        source_mtime=mtime,
+        source_size=size,
+        text=text,
+        contacts={
+            "email": sorted(set(EMAIL_PATTERN.findall(text))),
+            "phone": sorted(
+                set(
+                    match.strip()
+                    for match in PHONE_PATTERN.findall(text)
+                    # Date ranges like 2020-2024 also match the pattern but have fewer digits.
+                    if sum(char.isdigit() for char in match) >= MIN_PHONE_DIGITS
+                )
+            ),
+            "links": sorted(set(URL_PATTERN.findall(text))),
+        },
+        sections={
+            name: "\n".join(lines).strip()
+            for name, lines in sections.items()
+            if any(line.strip() for line in lines)
+        },
+    )
+    profile.digest = build_digest(profile)
+    return profile
+
+
+class CvCache:
+    """
+    Parses each CV PDF once and keeps the text and profile in `data/cv_cache/<name>.json`.
+    The cache is trusted while the PDF's mtime and size are unchanged; otherwise the PDF
+    is hashed and only re-parsed when its content really changed. Loaded profiles are
+    also kept in memory, so concurrent agents share one copy.
+    """
+
+    def __init__(self, cache_dir: Path = CV_CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self._profiles: dict[Path, CvProfile] = {}
+        self._lock = threading.Lock()
+
+    def _cache_path(self, pdf_path: Path) -> Path:
+        return self.cache_dir / f"{pdf_path.stem}.json"
+
+    def _read_cached(self, pdf_path: Path) -> Optional[CvProfile]:
+        try:
+            return CvProfile.model_validate_json(self._cache_path(pdf_path).read_text())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _write_cached(self, pdf_path: Path, profile: CvProfile):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(self._cache_path(pdf_path), profile.model_dump_json())
+
+    def _load(self, pdf_path: Path) -> CvProfile:
+        stat = pdf_path.stat()
+        profile = self._profiles.get(pdf_path) or self._read_cached(pdf_path)
+        if profile and (profile.source_mtime, profile.source_size) == (stat.st_mtime, stat.st_size):
+            return profile
+
+        content = pdf_path.read_bytes()
+        source_hash = hashlib.sha256(content).hexdigest()
+        if profile and profile.source_hash == source_hash:
+            profile = profile.model_copy(update={"source_mtime": stat.st_mtime})
+        else:
+            logger.info(f"Parsing CV {pdf_path}")
+            text = "\n".join(page.extract_text() or "" for page in PdfReader(pdf_path).pages)
+            profile = build_profile(text, source_hash, stat.st_mtime, stat.st_size)
+            logger.info(
+                f"Parsed CV with {len(text)} characters, sections: {', '.join(profile.sections)}"
+            )
+        self._write_cached(pdf_path, profile)
+        return profile
+
+    def load(self, pdf_path: Path) -> CvProfile:
+        pdf_path = Path(pdf_path).resolve()
+        with self._lock:
+            profile = self._load(pdf_path)
+            self._profiles[pdf_path] = profile
+        return profile
+
+
+_default_cv_cache = CvCache()
+
+
+def default_cv_cache() -> CvCache:
+    return _default_cv_cache
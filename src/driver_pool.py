@@ -0,0 +1,146 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+from src.logger import SingletonLogger
+from src.webdriver_init import WebDriverInit
+
+# --- Constants ---
+# Resident memory of one browser with a few pracuj.pl tabs open, measured on Firefox.
+DRIVER_MEMORY_BYTES = 600 * 1024 * 1024
+# Leaves room for the OS, the scraper pool and the agent browsers.
+MEMORY_HEADROOM_BYTES = 1024 * 1024 * 1024
+
+logger = SingletonLogger().get_logger()
+
+
+def available_memory_bytes() -> Optional[int]:
+    """Physical memory currently available, or None where the platform does not expose it."""
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def cap_driver_count(requested: int, driver_memory_bytes: int = DRIVER_MEMORY_BYTES) -> int:
+    """Limits `requested` browsers to what fits in available memory, keeping at least one."""
+    available = available_memory_bytes()
+    if available is None:
+        return max(1, requested)
+    fitting = (available - MEMORY_HEADROOM_BYTES) // driver_memory_bytes
+    capped = max(1, min(requested, fitting))
+    if capped < requested:
+        logger.warning(
+            f"Only {capped} of {requested} browsers fit in "
+            f"{available // (1024 * 1024)} MiB of available memory."
+        )
+    return capped
+
+
+def create_driver(headless: bool, browser: str) -> tuple:
+    if browser == "chrome":
+        return WebDriverInit(headless).create_chrome_driver()
+    return WebDriverInit(headless).create_firefox_driver()
+
+
+def seed_driver_cookies(driver, cookies: list[dict[str, Any]], replace: bool = False):
+    """
+    Copies an authenticated session into `driver`. Selenium only accepts cookies for
+    the domain of the current page, so each cookie domain is visited once. With `replace`,
+    the driver's own cookies of each domain are dropped first.
+    """
+    cookies_by_domain: dict[str, list[dict[str, Any]]] = {}
+    for cookie in cookies:
+        cookies_by_domain.setdefault(cookie.get("domain", "").lstrip("."), []).append(cookie)
+    for domain, domain_cookies in cookies_by_domain.items():
+        if not domain:
+            continue
+        driver.get(f"https://{domain}")
+        if replace:
+            driver.delete_all_cookies()
+        for cookie in domain_cookies:
+            try:
+                driver.add_cookie(cookie)
+            except Exception as e:
+                logger.debug(f"Could not add cookie {cookie.get('name', 'unknown')}: {e}")
+
+
+class DriverPool:
+    """
+    Logged-in drivers that share one pracuj.pl session. The first driver is the one that
+    logged in; the others are started in parallel and seeded with its cookies, so the
+    account is only logged into once. A renewed session is handed to every driver by the
+    thread that uses it, since a driver must not be driven from two threads.
+    """
+
+    def __init__(self, primary: tuple, headless: bool = True, browser: str = "firefox"):
+        self.headless = headless
+        self.browser = browser
+        self.drivers = [primary]
+        self._owned = []
+        self._session_cookies: Optional[list[dict[str, Any]]] = None
+        self._session_generation = 0
+        self._seeded_generations: dict[int, int] = {}
+        self._session_lock = threading.Lock()
+
+    def renew_session(self, cookies: list[dict[str, Any]]):
+        """Records renewed session cookies; each driver takes them before its next offer."""
+        with self._session_lock:
+            self._session_cookies = cookies
+            self._session_generation += 1
+
+    def reseed_if_stale(self, driver, window: str):
+        """
+        Replaces the cookies of `driver` with the renewed session, if it has not taken it
+        yet. The cookie domains are visited in `window`, and the focused tab is restored.
+        """
+        with self._session_lock:
+            generation, cookies = self._session_generation, self._session_cookies
+        if self._seeded_generations.get(id(driver), 0) >= generation:
+            return
+        focused_window = driver.current_window_handle
+        driver.switch_to.window(window)
+        try:
+            seed_driver_cookies(driver, cookies, replace=True)
+        finally:
+            driver.switch_to.window(focused_window)
+        self._seeded_generations[id(driver)] = generation
+        logger.debug("Renewed session cookies handed to a click driver.")
+
+    def _create_seeded(self, cookies: list[dict[str, Any]]) -> tuple:
+        driver, wait = create_driver(self.headless, self.browser)
+        try:
+            seed_driver_cookies(driver, cookies)
+        except Exception:
+            driver.quit()
+            raise
+        return driver, wait
+
+    def grow(self, size: int, cookies: list[dict[str, Any]]) -> list[tuple]:
+        """Starts drivers seeded with `cookies` until the pool holds `size`, capped by memory."""
+        missing = cap_driver_count(size) - len(self.drivers)
+        if missing <= 0:
+            return self.drivers
+        started = []
+        with ThreadPoolExecutor(max_workers=missing) as executor:
+            futures = [executor.submit(self._create_seeded, cookies) for _ in range(missing)]
+            for future in futures:
+                try:
+                    started.append(future.result())
+                except Exception as e:
+                    logger.error(f"Couldnt start an extra driver: {e}")
+        self._owned.extend(started)
+        self.drivers.extend(started)
+        logger.info(f"Applying with {len(self.drivers)} logged-in drivers.")
+        return self.drivers
+
+    def close(self):
+        """Quits the seeded drivers; the primary driver belongs to its creator."""
+        for driver, _ in self._owned:
+            try:
+                driver.quit()
+            except Exception as e:
+                logger.debug(f"Couldnt quit driver: {e}")
+        self.drivers = self.drivers[:1]
+        self._owned = []
@@ -0,0 +1,266 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import ContextManager, Optional
+
+from pydantic import BaseModel
+from requests import PreparedRequest, Response
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from src.logger import SingletonLogger
+from src.rate_limiter import is_throttled
+from src.storage import connect_sqlite, init_sqlite
+
+# --- Constants ---
+BASE_DIR = Path(__file__).resolve().parent.parent
+CACHE_PATH = BASE_DIR / "data" / "http_cache.sqlite"
+CACHE_MAX_BYTES = 200 * 1024 * 1024
+SECONDS_PER_MINUTE = 60
+URL_CLASS_TTLS = {
+    # Listings change whenever an offer is posted; offer pages rarely change once published.
+    "listing": 10 * SECONDS_PER_MINUTE,
+    "offer": 6 * 60 * SECONDS_PER_MINUTE,
+}
+URL_CLASS_PATTERNS = {"offer": re.compile(r",oferta,\d+")}
+DEFAULT_URL_CLASS = "listing"
+STORED_HEADERS = ("content-type", "etag", "last-modified")
+HTTP_OK = 200
+HTTP_NOT_MODIFIED = 304
+BYTES_PER_KIB = 1024
+
+logger = SingletonLogger().get_logger()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    cache_key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    url_class TEXT NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    last_access REAL NOT NULL
+)
+"""
+
+
+class CacheStats(BaseModel):
+    hits: int = 0
+    revalidated: int = 0
+    misses: int = 0
+    bytes_saved: int = 0
+
+    @property
+    def requests(self) -> int:
+        return self.hits + self.revalidated + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return (self.hits + self.revalidated) / self.requests if self.requests else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.requests} requests, {self.hit_rate:.0%} served from cache "
+            f"({self.hits} fresh hits, {self.revalidated} revalidated with 304), "
+            f"{self.bytes_saved / BYTES_PER_KIB:.0f} KiB saved"
+        )
+
+
+class CacheEntry(BaseModel):
+    headers: dict[str, str]
+    body: bytes
+    fetched_at: float
+    url_class: str
+
+
+def classify_url(url: str) -> str:
+    """Returns the URL class whose TTL applies to `url`."""
+    for url_class, pattern in URL_CLASS_PATTERNS.items():
+        if pattern.search(url):
+            return url_class
+    return DEFAULT_URL_CLASS
+
+
+class HttpCache:
+    """
+    Size-bounded on-disk cache of GET responses, stored in SQLite.
+    Entries younger than their URL class TTL are served without touching the network;
+    older ones are revalidated with ETag/Last-Modified. The least recently used entries
+    are evicted once the stored bodies exceed `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        path: Path = CACHE_PATH,
+        max_bytes: int = CACHE_MAX_BYTES,
+        ttls: Optional[dict[str, int]] = None,
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.ttls = {**URL_CLASS_TTLS, **(ttls or {})}
+        self.stats = CacheStats()
+        self._stats_lock = threading.Lock()
+        init_sqlite(self.path, SCHEMA)
+
+    def _connect(self) -> ContextManager[sqlite3.Connection]:
+        return connect_sqlite(self.path)
+
+    @staticmethod
+    def cache_key(request: PreparedRequest) -> str:
+        # Logged-in views differ per account (e.g. "already applied"), so each set of cookies
+        # gets its own entries; anonymous requests share theirs.
+        audience = request.headers.get("Cookie", "")
+        return hashlib.sha256(f"{audience}|{request.url}".encode()).hexdigest()
+
+    def record(self, outcome: str, bytes_saved: int = 0):
+        with self._stats_lock:
+            setattr(self.stats, outcome, getattr(self.stats, outcome) + 1)
+            self.stats.bytes_saved += bytes_saved
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return time.time() - entry.fetched_at < self.ttls.get(entry.url_class, 0)
+
+    def load(self, cache_key: str) -> Optional[CacheEntry]:
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT headers, body, fetched_at, url_class FROM responses WHERE cache_key = ?",
+                (cache_key,),
+            ).fetchone()
+            if row is None:
+                return None
+            connection.execute(
+                "UPDATE responses SET last_access = ? WHERE cache_key = ?",
+                (time.time(), cache_key),
+            )
+        headers, body, fetched_at, url_class = row
+        return CacheEntry(
+            headers=json.loads(headers),
+            body=body,
+            fetched_at=fetched_at,
+            url_class=url_class,
+        )
+
+    def store(self, cache_key: str, url: str, headers: dict[str, str], body: bytes):
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(cache_key, url, url_class, headers, body, size, fetched_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (cache_key, url, classify_url(url), json.dumps(headers), body, len(body), now, now),
+            )
+            self._evict(connection)
+
+    def touch(self, cache_key: str, headers: dict[str, str]):
+        """Marks a revalidated entry as fresh again, taking over any new validators."""
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT headers FROM responses WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+            if row is None:
+                return
+            merged_headers = {**json.loads(row[0]), **headers}
+            connection.execute(
+                "UPDATE responses SET headers = ?, fetched_at = ? WHERE cache_key = ?",
+                (json.dumps(merged_headers), time.time(), cache_key),
+            )
+
+    def _evict(self, connection: sqlite3.Connection):
+        total_size = connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+        if total_size <= self.max_bytes:
+            return
+        evicted = 0
+        for cache_key, size in connection.execute(
+            "SELECT cache_key, size FROM responses ORDER BY last_access"
+        ).fetchall():
+            if total_size <= self.max_bytes:
+                break
+            connection.execute("DELETE FROM responses WHERE cache_key = ?", (cache_key,))
+            total_size -= size
+            evicted += 1
+        logger.debug(f"Evicted {evicted} least recently used responses from HTTP cache.")
+
+
+class CachingHTTPAdapter(HTTPAdapter):
+    """Transport adapter that answers GET requests from an HttpCache when it can."""
+
+    def __init__(self, *args, cache: HttpCache, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache = cache
+
+    @staticmethod
+    def _stored_headers(headers: CaseInsensitiveDict) -> dict[str, str]:
+        return {name: headers[name] for name in STORED_HEADERS if name in headers}
+
+    @staticmethod
+    def _build_response(request: PreparedRequest, entry: CacheEntry) -> Response:
+        response = Response()
+        response.status_code = HTTP_OK
+        response.reason = "OK"
+        response.headers = CaseInsensitiveDict(entry.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = entry.body
+        response.url = request.url
+        response.request = request
+        return response
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        if request.method != "GET":
+            return super().send(request, **kwargs)
+
+        cache_key = self.cache.cache_key(request)
+        entry = self.cache.load(cache_key)
+        if entry is not None and self.cache.is_fresh(entry):
+            self.cache.record("hits", len(entry.body))
+            return self._build_response(request, entry)
+
+        if entry is not None:
+            if "etag" in entry.headers:
+                request.headers["If-None-Match"] = entry.headers["etag"]
+            if "last-modified" in entry.headers:
+                request.headers["If-Modified-Since"] = entry.headers["last-modified"]
+
+        response = super().send(request, **kwargs)
+        if response.status_code == HTTP_NOT_MODIFIED and entry is not None:
+            self.cache.touch(cache_key, self._stored_headers(response.headers))
+            self.cache.record("revalidated", len(entry.body))
+            response.close()
+            return self._build_response(request, entry)
+
+        self.cache.record("misses")
+        cache_control = response.headers.get("cache-control", "")
+        # A challenge page served with 200 would otherwise be replayed until it expires.
+        if (
+            response.status_code == HTTP_OK
+            and "no-store" not in cache_control
+            and not is_throttled(response.status_code, response.text)
+        ):
+            self.cache.store(
+                cache_key,
+                request.url,
+                self._stored_headers(response.headers),
+                response.content,
+            )
+        return response
+
+
+_default_cache: Optional[HttpCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def default_http_cache() -> HttpCache:
+    """Process-wide cache shared by every HTTP session, so run statistics add up in one place."""
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = HttpCache()
+    return _default_cache
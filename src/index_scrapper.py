@@ -1,66 +1,240 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.cookies import RequestsCookieJar
+from pydantic import BaseModel
 from selenium.webdriver.common.by import By
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import closing
+from multiprocessing.util import Finalize
+from typing import Iterator
 import multiprocessing
+import queue
+import threading
 from src.webdriver_init import WebDriverInit
 from src.logger import SingletonLogger
+from src.offer_parser import OfferRecord, canonical_offer_id, parse_listing
+from src.http_cache import CachingHTTPAdapter, default_http_cache
+from src.rate_limiter import RateLimitedHTTPAdapter, default_rate_limiter, is_throttled
+from urllib.parse import urlsplit
+import time
+
+# --- Constants ---
+REQUEST_TIMEOUT = 10
+HTTP_POOL_SIZE = 8
+BROWSER_RESTART_AFTER_PAGES = 25
+BROWSER_WORKER_EXIT_PRIORITY = 10
+OFFER_QUEUE_SIZE = 50
+QUEUE_PUT_POLL_SECONDS = 0.5
+INCREMENTAL_OVERLAP_PAGES = 1
+SPECULATIVE_PAGES = 3
+DYNAMIC_BUTTONS_XPATH = (
+    "//div[@class='tiles_cobg3mp' and @tabindex='0' and @role='button']"
+)
 
 logger = SingletonLogger().get_logger()
 
+_END_OF_STREAM = object()
 
-class PageNavigator:
-    """Handles navigation and determination of the maximum page number for a given URL."""
 
-    def __init__(self, base_url: str):
-        self.base_url = base_url
+class ScraperHTTPAdapter(CachingHTTPAdapter, RateLimitedHTTPAdapter):
+    """Answers GETs from the HTTP cache; only requests that reach the network are rate limited."""
 
-    def get_max_page_number(self) -> int:
-        """Determines the maximum page number from the initial URL."""
-        headers = {"user-agent": WebDriverInit.create_useragent()}
+
+def create_http_session(
+    pool_size: int = HTTP_POOL_SIZE,
+    use_cache: bool = True,
+    cookies: RequestsCookieJar | None = None,
+) -> requests.Session:
+    """
+    Creates a requests.Session whose connection pool fits `pool_size` concurrent fetches.
+    Network requests are paced by the shared adaptive rate limiter, and GET responses go
+    through the shared on-disk HTTP cache unless `use_cache` is off. Sessions given the
+    same `cookies` jar share one login.
+    """
+    session = requests.Session()
+    if cookies is not None:
+        session.cookies = cookies
+    pool_options = {"pool_connections": pool_size, "pool_maxsize": pool_size}
+    if use_cache:
+        adapter = ScraperHTTPAdapter(
+            cache=default_http_cache(), limiter=default_rate_limiter(), **pool_options
+        )
+    else:
+        adapter = RateLimitedHTTPAdapter(limiter=default_rate_limiter(), **pool_options)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"user-agent": WebDriverInit.create_useragent()})
+    return session
+
+
+class ListingPageResult(BaseModel):
+    """Outcome of scraping one listing page over HTTP."""
+
+    url: str
+    page_num: int = 1
+    max_page: int | None = None
+    offers: list[OfferRecord] = []
+    needs_browser: bool = False
+
+    @property
+    def offer_urls(self) -> list[str]:
+        return [offer.url for offer in self.offers]
+
+
+class HttpScraper:
+    """
+    Scrapes listing pages with plain HTTP requests over a pooled session.
+    Pages whose offers are hidden behind dynamic buttons are flagged for the browser.
+    """
+
+    def __init__(self, session: requests.Session | None = None):
+        self.session = session or create_http_session()
+
+    def scrape_urls(self, url: str, page_num: int = 1) -> ListingPageResult:
+        """Downloads a listing page and extracts offer URLs and the page count from its HTML."""
         try:
-            response = requests.get(self.base_url, headers=headers, timeout=10)
+            response = self.session.get(url, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
-            soup = BeautifulSoup(response.text, "html.parser")
-            max_page_element = soup.find(
-                "span", {"data-test": "top-pagination-max-page-number"}
+        except requests.exceptions.RequestException as req_err:
+            logger.warning(f"HTTP fetch failed for {url}, falling back to browser: {req_err}")
+            return ListingPageResult(url=url, page_num=page_num, needs_browser=True)
+
+        listing = parse_listing(response.text)
+        if listing.has_hidden_offers:
+            logger.debug(f"{url} hides offers behind dynamic buttons, needs browser.")
+            return ListingPageResult(
+                url=url,
+                page_num=page_num,
+                max_page=listing.max_page,
+                needs_browser=True,
             )
 
-            if max_page_element:
-                max_page = int(max_page_element.text.strip())
-                logger.debug(f"Max page number found: {max_page}")
-                return max_page
-            else:
-                logger.debug(
-                    "No explicit max page number element found. Assuming 1 page."
-                )
-                return 1
+        logger.info(
+            f"Scraped {len(listing.offers)} URLs from {url} over HTTP ({listing.backend})."
+        )
+        return ListingPageResult(
+            url=url,
+            page_num=page_num,
+            max_page=listing.max_page,
+            offers=listing.offers,
+        )
 
-        except requests.exceptions.RequestException as req_err:
-            logger.error(
-                f"Request error for {self.base_url}: {req_err}")
+
+class PageNavigator:
+    """
+    Fetches the listing pages of a filtered search and returns them as page results.
+
+    Page discovery is not a separate request: the first page is fetched once and yields
+    both its offers and the page count (`discover`). `iter_pages` fetches page 1 together
+    with a few speculative pages, so discovery overlaps with scraping pages 2..N.
+    """
+
+    def __init__(self, base_url: str, session: requests.Session | None = None):
+        self.base_url = base_url
+        self.session = session or create_http_session()
+        self.http_scraper = HttpScraper(self.session)
+
+    def fetch_page(self, page_num: int) -> ListingPageResult:
+        """Fetches and parses a single listing page."""
+        return self.http_scraper.scrape_urls(self.page_url(page_num), page_num)
+
+    def discover(self) -> ListingPageResult:
+        """
+        Fetches the first page; its result carries the page count alongside its offers,
+        or None when the page failed or the count could not be read.
+        """
+        first_page = self.fetch_page(1)
+        logger.debug(f"Max page number found: {first_page.max_page}")
+        return first_page
+
+    def get_max_page_number(self) -> int:
+        """Determines the maximum page number from the initial URL."""
+        max_page = self.discover().max_page
+        if max_page is None:
+            logger.error(f"Couldnt read the page count of {self.base_url}, assuming 1 page.")
             return 1
-        except Exception as e:
-            logger.error(
-                f"An unexpected error occurred for {self.base_url}: {e}")
+        return max_page
+
+    @staticmethod
+    def _page_count(results: list[ListingPageResult], still_fetching: bool) -> int | None:
+        """
+        Page count once page 1 is in. When page 1 failed to report it, any other fetched
+        page that did is used instead; 1 is assumed only when none of them can.
+        """
+        first_page = next((result for result in results if result.page_num == 1), None)
+        if first_page is None:
+            return None
+        if first_page.max_page:
+            return first_page.max_page
+        page_counts = [result.max_page for result in results if result.max_page]
+        if not page_counts:
+            if still_fetching:
+                return None
+            logger.error("Couldnt read the page count of the listing, assuming 1 page.")
             return 1
+        return max(page_counts)
+
+    def iter_pages(self, max_workers: int = HTTP_POOL_SIZE) -> Iterator[ListingPageResult]:
+        """
+        Yields a result for every listing page as soon as it is fetched, keeping at most
+        `max_workers` requests in flight. Page 1 comes first; speculative pages fetched
+        before the page count was known are dropped if they turn out to be past the last page.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            in_flight = {
+                executor.submit(self.fetch_page, page_num)
+                for page_num in range(1, min(SPECULATIVE_PAGES + 1, max_workers) + 1)
+            }
+            next_page = len(in_flight) + 1
+            max_page = None
+            held_results = []
+            while in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    if max_page is None:
+                        held_results.append(result)
+                    elif result.page_num <= max_page:
+                        yield result
+
+                if max_page is None:
+                    max_page = self._page_count(held_results, still_fetching=bool(in_flight))
+                    if max_page is not None:
+                        held_results.sort(key=lambda held: held.page_num != 1)
+                        yield from (
+                            held for held in held_results if held.page_num <= max_page
+                        )
+                        held_results = []
+
+                while (
+                    max_page is not None
+                    and next_page <= max_page
+                    and len(in_flight) < max_workers
+                ):
+                    in_flight.add(executor.submit(self.fetch_page, next_page))
+                    next_page += 1
+
+    def page_url(self, page_num: int) -> str:
+        """Returns the URL of the given listing page."""
+        if page_num == 1:
+            return self.base_url
+        if "?" in self.base_url:
+            return f"{self.base_url}&pn={page_num}"
+        return f"{self.base_url}?pn={page_num}"
 
     def generate_all_page_urls(self) -> list[str]:
         """Generates a list of all page URLs to be scraped."""
         num_of_pages = self.get_max_page_number()
-        list_of_urls = [self.base_url]
-        for page_num in range(2, num_of_pages + 1):
-            if "?" in self.base_url:
-                list_of_urls.append(f"{self.base_url}&pn={page_num}")
-            else:
-                list_of_urls.append(f"{self.base_url}?pn={page_num}")
+        list_of_urls = [
+            self.page_url(page_num) for page_num in range(1, num_of_pages + 1)
+        ]
         logger.debug(f"Generated {len(list_of_urls)} URLs for scraping.")
         return list_of_urls
 
 
 class SeleniumScraper:
     """
-    Scrapes URLs from a dynamic page using Selenium and BeautifulSoup.
+    Scrapes URLs from a dynamic page using Selenium.
     Handles clicking buttons to reveal more offers.
     """
 
@@ -88,11 +262,8 @@ class SeleniumScraper:
 
     def _click_dynamic_buttons(self):
         """Attempts to find and click buttons that reveal more offers."""
-        xpath_buttons = (
-            "//div[@class='tiles_cobg3mp' and @tabindex='0' and @role='button']"
-        )
         try:
-            buttons = self.driver.find_elements(By.XPATH, xpath_buttons)
+            buttons = self.driver.find_elements(By.XPATH, DYNAMIC_BUTTONS_XPATH)
             if buttons:
                 logger.debug(f"Found {len(buttons)} button(s) to click on the page.")
                 for i, button in enumerate(buttons):
@@ -117,27 +288,34 @@ class SeleniumScraper:
     def scrape_urls(self, url: str) -> list[str]:
         """Navigates to a URL, interacts with the page, and scrapes target URLs."""
         scraped_urls = []
+        host = urlsplit(url).hostname or ""
         try:
+            default_rate_limiter().acquire(host)
+            started = time.monotonic()
             self.driver.get(url)
+            default_rate_limiter().report(
+                host,
+                time.monotonic() - started,
+                is_throttled(None, self.driver.page_source),
+            )
             logger.debug(f"Navigated to: {url}")
             self._click_dynamic_buttons()
 
-            page_source = self.driver.page_source
-            soup = BeautifulSoup(page_source, "html.parser")
-            target_links = soup.find_all(attrs={"data-test": "link-offer"})
-
-            for link in target_links:
-                href = link.get("href")
-                if (
-                    href and "boosterAI" not in href
-                ):  # pracuj.pl has boosterai promotion, so promoted offers repeat twice if "boosterAI" not in href not set
-                    scraped_urls.append(href)
+            scraped_urls = parse_listing(self.driver.page_source).offer_urls
             logger.info(f"Scraped {len(scraped_urls)} URLs from {url}.")
 
         except Exception as e:
             logger.error(f"An error occurred while scraping {url}: {e}")
         return scraped_urls
 
+    def is_alive(self) -> bool:
+        """Checks whether the browser behind the driver still responds."""
+        try:
+            _ = self.driver.current_url
+            return True
+        except WebDriverException:
+            return False
+
     def close_driver(self):
         """Closes the Selenium WebDriver."""
         if self.driver:
@@ -145,35 +323,280 @@ class SeleniumScraper:
             logger.debug("Selenium WebDriver closed.")
 
 
+class BrowserWorker:
+    """
+    Keeps one SeleniumScraper alive for the whole life of a pool process.
+    The driver is recycled after `restart_after_pages` pages to cap browser memory
+    growth, and restarted immediately when it crashes.
+    """
+
+    def __init__(
+        self,
+        headless: bool = True,
+        browser: str = "firefox",
+        restart_after_pages: int = BROWSER_RESTART_AFTER_PAGES,
+    ):
+        self.headless = headless
+        self.browser = browser
+        self.restart_after_pages = restart_after_pages
+        self.scraper = None
+        self.pages_scraped = 0
+
+    def _restart(self):
+        self.close()
+        self.scraper = SeleniumScraper(headless=self.headless, browser=self.browser)
+        self.pages_scraped = 0
+
+    def scrape_urls(self, url: str) -> list[str]:
+        """Scrapes a page on the long-lived driver, retrying once on a fresh one if it crashed."""
+        if self.scraper is None or self.pages_scraped >= self.restart_after_pages:
+            self._restart()
+
+        scraped_urls = self.scraper.scrape_urls(url)
+        self.pages_scraped += 1
+        if not scraped_urls and not self.scraper.is_alive():
+            logger.warning(f"Browser crashed while scraping {url}, restarting it.")
+            self._restart()
+            scraped_urls = self.scraper.scrape_urls(url)
+            self.pages_scraped += 1
+        return scraped_urls
+
+    def close(self):
+        if self.scraper:
+            try:
+                self.scraper.close_driver()
+            except WebDriverException as e:
+                logger.debug(f"Driver was already gone while closing: {e}")
+            self.scraper = None
+
+
+_browser_worker: BrowserWorker | None = None
+_stop_scraping = None
+
+
+def _init_browser_worker(
+    headless: bool, browser: str, restart_after_pages: int, stop_scraping
+):
+    """Pool initializer: creates the per-process worker and closes its browser on process exit."""
+    global _browser_worker, _stop_scraping
+    _browser_worker = BrowserWorker(headless, browser, restart_after_pages)
+    _stop_scraping = stop_scraping
+    Finalize(
+        _browser_worker,
+        _browser_worker.close,
+        exitpriority=BROWSER_WORKER_EXIT_PRIORITY,
+    )
+
+
+def _scrape_with_browser_worker(url: str) -> list[str]:
+    if _stop_scraping.is_set():
+        return []
+    return _browser_worker.scrape_urls(url)
+
+
 class ScraperManager:
-    """Manages the overall scraping process, including multiprocessing."""
+    """
+    Manages the overall scraping process. Listing pages are fetched over HTTP first;
+    only pages that need clicking are handed to Selenium workers.
+    """
 
-    def __init__(self, base_url: str, headless: bool = True, browser: str = "firefox"):
+    def __init__(
+        self,
+        base_url: str,
+        headless: bool = True,
+        browser: str = "firefox",
+        http_first: bool = True,
+        restart_after_pages: int = BROWSER_RESTART_AFTER_PAGES,
+        known_offer_ids: set[str] | None = None,
+        overlap_pages: int = INCREMENTAL_OVERLAP_PAGES,
+        cookies: RequestsCookieJar | None = None,
+    ):
+        """
+        Passing `known_offer_ids` switches to incremental mode, which assumes the
+        filtered URL is sorted newest-first (see `_iter_incremental_results`).
+        `cookies` is a jar shared with other HTTP sessions, e.g. a logged-in one.
+        """
         self.base_url = base_url
-        self.page_navigator = PageNavigator(base_url)
+        self.session = create_http_session(cookies=cookies)
+        self.page_navigator = PageNavigator(base_url, session=self.session)
         self.headless = headless
-        self.browser = browser 
+        self.browser = browser
+        self.http_first = http_first
+        self.restart_after_pages = restart_after_pages
+        self.known_offer_ids = known_offer_ids
+        self.overlap_pages = overlap_pages
 
-    def _scrape_single_page(self, url: str) -> list[str]:
-        """Scrapes single page"""
-        scraper = SeleniumScraper(headless=self.headless, browser=self.browser)
+    def _only_known_offers(self, result: ListingPageResult) -> bool:
+        # Promoted offers are pinned regardless of date, so they say nothing about ordering.
+        # A page without regular offers (empty or failed to scrape) proves nothing either.
+        offer_ids = [
+            canonical_offer_id(offer.url) for offer in result.offers if not offer.promoted
+        ]
+        return bool(offer_ids) and all(
+            offer_id in self.known_offer_ids for offer_id in offer_ids
+        )
+
+    def _iter_incremental_results(self) -> Iterator[ListingPageResult]:
+        """
+        Fetches pages one by one in order and stops after `overlap_pages` consecutive
+        pages whose offers were all seen in earlier runs. The overlap absorbs offers
+        that were reordered or bumped since the last run. Without a page count, pages
+        are fetched until one is empty or repeats the previous one.
+        """
+        browser_worker = None
+        known_pages_in_a_row = 0
+        previous_offer_urls = None
         try:
-            return scraper.scrape_urls(url)
+            result = self.page_navigator.discover()
+            max_page = result.max_page
+            if max_page is None:
+                logger.warning(
+                    f"Couldnt read the page count of {self.base_url}, "
+                    "crawling until the listing runs out."
+                )
+            page_num = 1
+            while max_page is None or page_num <= max_page:
+                url = self.page_navigator.page_url(page_num)
+                if page_num > 1:
+                    result = self.page_navigator.fetch_page(page_num)
+                    max_page = max_page or result.max_page
+                if result.needs_browser:
+                    browser_worker = browser_worker or BrowserWorker(
+                        self.headless, self.browser, self.restart_after_pages
+                    )
+                    result = ListingPageResult(
+                        url=url,
+                        page_num=page_num,
+                        offers=[
+                            OfferRecord(url=offer_url)
+                            for offer_url in browser_worker.scrape_urls(url)
+                        ],
+                    )
+                if max_page is None and result.offer_urls in ([], previous_offer_urls):
+                    logger.info(f"The listing ends at page {page_num - 1}.")
+                    return
+                yield result
+
+                if self._only_known_offers(result):
+                    known_pages_in_a_row += 1
+                else:
+                    known_pages_in_a_row = 0
+                if known_pages_in_a_row >= self.overlap_pages:
+                    logger.info(
+                        f"Page {page_num}/{max_page or '?'} holds only known offers, "
+                        "stopping incremental crawl."
+                    )
+                    return
+                previous_offer_urls = result.offer_urls
+                page_num += 1
         finally:
-            scraper.close_driver()  # Ensure driver is closed after each page's scraping in the pool
+            if browser_worker:
+                browser_worker.close()
 
-    def run_scraper(self) -> list[str]:
-        """Executes the web scraping process using multiprocessing."""
-        urls_to_scrape = self.page_navigator.generate_all_page_urls()
-        scraped_data = []
-        num_processes = multiprocessing.cpu_count() - 1
+    def _iter_browser_results(self, urls: list[str]) -> Iterator[list[str]]:
+        """Yields per-page results from a pool of processes that each reuse one long-lived browser."""
+        num_processes = min(multiprocessing.cpu_count() - 1, len(urls))
         if num_processes < 1:
             num_processes = 1
-        logger.debug(f"Starting multiprocessing with {num_processes} processes.")
-        with multiprocessing.Pool(processes=num_processes) as pool:
-            for res in pool.imap_unordered(self._scrape_single_page, urls_to_scrape):
-                scraped_data.extend(res)
-        logger.info(f"Finished scraping. Total URLs collected: {len(scraped_data)}")
-        return scraped_data
+        logger.debug(f"Starting browser worker pool with {num_processes} processes.")
+        stop_scraping = multiprocessing.Event()
+        pool = multiprocessing.Pool(
+            processes=num_processes,
+            initializer=_init_browser_worker,
+            initargs=(self.headless, self.browser, self.restart_after_pages, stop_scraping),
+        )
+        try:
+            yield from pool.imap_unordered(_scrape_with_browser_worker, urls)
+        finally:
+            # Never terminate: a killed worker skips its Finalize and leaks its browser.
+            # When the consumer stops early, queued pages are skipped instead, so joining
+            # only waits for the pages already being scraped.
+            stop_scraping.set()
+            pool.close()
+            pool.join()
+
+    def _iter_scraped_urls(self) -> Iterator[str]:
+        """Yields offer URLs page by page, starting browsers only where HTTP is not enough."""
+        if self.known_offer_ids is not None:
+            for result in self._iter_incremental_results():
+                yield from result.offer_urls
+            return
+
+        if self.http_first:
+            browser_urls = []
+            http_pages = 0
+            for result in self.page_navigator.iter_pages():
+                if result.needs_browser:
+                    browser_urls.append(result.url)
+                else:
+                    http_pages += 1
+                    yield from result.offer_urls
+            logger.debug(
+                f"{http_pages} page(s) scraped over HTTP, "
+                f"{len(browser_urls)} need a browser."
+            )
+        else:
+            browser_urls = self.page_navigator.generate_all_page_urls()
+
+        if browser_urls:
+            for offer_urls in self._iter_browser_results(browser_urls):
+                yield from offer_urls
+
+    @staticmethod
+    def _put_until_stopped(offer_queue: queue.Queue, item, stop_event: threading.Event) -> bool:
+        """Blocks on a full queue until there is room or the consumer went away."""
+        while not stop_event.is_set():
+            try:
+                offer_queue.put(item, timeout=QUEUE_PUT_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce_offers(self, offer_queue: queue.Queue, stop_event: threading.Event):
+        try:
+            with closing(self._iter_scraped_urls()) as scraped_urls:
+                for url in scraped_urls:
+                    if not self._put_until_stopped(offer_queue, url, stop_event):
+                        logger.debug("Offer stream consumer stopped, ending scraping early.")
+                        return
+        except Exception as e:
+            logger.error(f"Scraping failed while streaming offers: {e}")
+            self._put_until_stopped(offer_queue, e, stop_event)
+            return
+        self._put_until_stopped(offer_queue, _END_OF_STREAM, stop_event)
 
+    def iter_offers(self, max_pending: int = OFFER_QUEUE_SIZE) -> Iterator[str]:
+        """
+        Streams unique offer URLs while scraping is still running.
+        At most `max_pending` unconsumed URLs are buffered; beyond that the scraper blocks,
+        so a slow consumer throttles scraping instead of piling up work.
+        """
+        offer_queue = queue.Queue(maxsize=max_pending)
+        stop_event = threading.Event()
+        producer = threading.Thread(
+            target=self._produce_offers, args=(offer_queue, stop_event), daemon=True
+        )
+        producer.start()
+        seen_offer_ids = set()
+        try:
+            while True:
+                item = offer_queue.get()
+                if item is _END_OF_STREAM:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                offer_id = canonical_offer_id(item)
+                if offer_id in seen_offer_ids:
+                    continue
+                seen_offer_ids.add(offer_id)
+                yield item
+        finally:
+            stop_event.set()
+        logger.info(f"Finished streaming. Total URLs collected: {len(seen_offer_ids)}")
 
+    def run_scraper(self) -> list[str]:
+        """Executes the web scraping process, starting browsers only where HTTP is not enough."""
+        scraped_data = list(self._iter_scraped_urls())
+        logger.info(f"Finished scraping. Total URLs collected: {len(scraped_data)}")
+        return scraped_data
@@ -0,0 +1,224 @@
+import asyncio
+import copy
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+import httpx
+from pydantic import BaseModel
+
+from browser_use import (
+    ChatAnthropic,
+    ChatAzureOpenAI,
+    ChatGoogle,
+    ChatGroq,
+    ChatOllama,
+    ChatOpenAI,
+)
+from browser_use.llm.base import BaseChatModel
+from browser_use.llm.exceptions import ModelRateLimitError
+
+from src.logger import SingletonLogger
+
+# --- Constants ---
+PROVIDER_MODELS = {
+    "OpenAI": ChatOpenAI,
+    "Anthropic": ChatAnthropic,
+    "AzureOpenAI": ChatAzureOpenAI,
+    "Google": ChatGoogle,
+    "Groq": ChatGroq,
+    "Ollama": ChatOllama,
+    "OpenAI_compatible": ChatOpenAI,
+}
+WINDOW_SECONDS = 60
+# Budget reserved for a call before its real usage is known; a browser agent step with
+# the page state and the action schema is usually this large.
+DEFAULT_TOKENS_PER_CALL = 8000
+# Weight of the latest call in the moving average of tokens per call.
+TOKENS_PER_CALL_SMOOTHING = 0.2
+MAX_RATE_LIMIT_RETRIES = 5
+RATE_LIMIT_BASE_BACKOFF = 5.0
+RATE_LIMIT_MAX_BACKOFF = 120.0
+HTTP_MAX_CONNECTIONS = 20
+HTTP_TIMEOUT_SECONDS = 120
+
+logger = SingletonLogger().get_logger()
+
+
+class LlmLimits(BaseModel):
+    """Provider quota for one model; None leaves that dimension unlimited."""
+
+    requests_per_minute: Optional[int] = None
+    tokens_per_minute: Optional[int] = None
+
+
+class LlmBudget:
+    """
+    Sliding one-minute window of requests and tokens shared by every agent using one model.
+    Callers wait in `acquire` until the call fits in both limits, so requests queue at the
+    limit instead of being rejected by the provider. Each call reserves the running
+    average of tokens per call, corrected by `settle` once the response reports its usage.
+    """
+
+    def __init__(self, limits: LlmLimits):
+        self.limits = limits
+        self._calls: deque[list[float]] = deque()
+        self._tokens_per_call = float(DEFAULT_TOKENS_PER_CALL)
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _wait_seconds(self, now: float) -> float:
+        while self._calls and self._calls[0][0] <= now - WINDOW_SECONDS:
+            self._calls.popleft()
+        if self._paused_until > now:
+            return self._paused_until - now
+        if not self._calls:
+            return 0.0
+        window_end = self._calls[0][0] + WINDOW_SECONDS - now
+        rpm, tpm = self.limits.requests_per_minute, self.limits.tokens_per_minute
+        if rpm and len(self._calls) >= rpm:
+            return window_end
+        used = sum(tokens for _, tokens in self._calls)
+        if tpm and used + self._tokens_per_call > tpm:
+            return window_end
+        return 0.0
+
+    async def acquire(self) -> list[float]:
+        """Waits for room in the window and returns the reservation to `settle` later."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wait = self._wait_seconds(now)
+                if wait <= 0:
+                    reservation = [now, self._tokens_per_call]
+                    self._calls.append(reservation)
+                    return reservation
+            logger.debug(f"LLM budget exhausted, waiting {wait:.1f}s.")
+            await asyncio.sleep(wait)
+
+    def settle(self, reservation: list[float], tokens: Optional[int]):
+        if tokens is None:
+            return
+        with self._lock:
+            reservation[1] = tokens
+            self._tokens_per_call += TOKENS_PER_CALL_SMOOTHING * (tokens - self._tokens_per_call)
+
+    def pause(self, seconds: float):
+        """Holds every caller back, e.g. after the provider answered 429 anyway."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class SharedLlm:
+    """One configured model: the client template, its HTTP connection pool and its budget."""
+
+    def __init__(self, model: BaseChatModel, limits: LlmLimits):
+        self.model = model
+        self.budget = LlmBudget(limits)
+        self._http_client: Optional[httpx.AsyncClient] = None
+
+    def _shared_http_client(self) -> httpx.AsyncClient:
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS),
+                timeout=HTTP_TIMEOUT_SECONDS,
+            )
+        return self._http_client
+
+    def chat_model(self) -> BaseChatModel:
+        """
+        Per-agent copy of the model whose calls go through the shared budget. Copies keep
+        the provider class, which the agent inspects, and each agent's token accounting
+        wraps only its own copy. Providers that accept an `http_client` share one pool.
+        """
+        model = copy.copy(self.model)
+        if hasattr(model, "http_client"):
+            model.http_client = self._shared_http_client()
+        invoke = model.ainvoke
+        budget = self.budget
+
+        async def ainvoke(messages, output_format=None, **kwargs):
+            for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+                reservation = await budget.acquire()
+                try:
+                    response = await invoke(messages, output_format, **kwargs)
+                except ModelRateLimitError:
+                    if attempt == MAX_RATE_LIMIT_RETRIES:
+                        raise
+                    backoff = min(RATE_LIMIT_MAX_BACKOFF, RATE_LIMIT_BASE_BACKOFF * 2**attempt)
+                    logger.info(
+                        f"{model.provider} rate limit hit, pausing its calls for {backoff:.0f}s."
+                    )
+                    budget.pause(backoff)
+                    continue
+                usage = response.usage
+                budget.settle(reservation, usage.total_tokens if usage else None)
+                return response
+
+        model.ainvoke = ainvoke
+        return model
+
+    async def aclose(self):
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+
+class LlmRegistry:
+    """
+    Process-wide registry of models keyed by provider, model name and base URL, so all
+    concurrent agents using the same model share its connections and its rate limits.
+    """
+
+    def __init__(self):
+        self._models: dict[tuple[str, str, Optional[str]], SharedLlm] = {}
+        self._lock = threading.Lock()
+
+    def _create_model(
+        self, provider: str, model_name: str, base_url: Optional[str], api_key: Optional[str]
+    ) -> BaseChatModel:
+        try:
+            model_class = PROVIDER_MODELS[provider]
+        except KeyError:
+            raise ValueError(f"Unsupported provider: {provider}")
+        if provider == "OpenAI_compatible":
+            return model_class(model=model_name, base_url=base_url, api_key=api_key)
+        return model_class(model=model_name)
+
+    def chat_model(
+        self,
+        provider: str,
+        model_name: str,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        limits: Optional[LlmLimits] = None,
+    ) -> BaseChatModel:
+        """Returns a rate-limited model for one agent; `limits` update the shared budget."""
+        key = (provider, model_name, base_url)
+        with self._lock:
+            shared = self._models.get(key)
+            if shared is None:
+                shared = SharedLlm(
+                    self._create_model(provider, model_name, base_url, api_key),
+                    limits or LlmLimits(),
+                )
+                self._models[key] = shared
+            elif limits is not None:
+                shared.budget.limits = limits
+        return shared.chat_model()
+
+    async def aclose(self):
+        """
+        Closes the shared connection pools. They belong to the event loop that opened them,
+        so this is called before that loop ends; budgets are kept for the next run.
+        """
+        for shared in list(self._models.values()):
+            await shared.aclose()
+
+
+_default_llm_registry = LlmRegistry()
+
+
+def default_llm_registry() -> LlmRegistry:
+    return _default_llm_registry
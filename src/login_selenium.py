@@ -3,18 +3,104 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 import pickle
 import os
-from typing import Optional, List, Dict, Any
+from typing import Callable, Optional, List, Dict, Any
 from src.logger import SingletonLogger
+from src.storage import atomic_write_text
 import sys
 import json
+import threading
+import time
 from pathlib import Path
+import requests
+from requests.cookies import RequestsCookieJar
 from selenium.common.exceptions import StaleElementReferenceException
 
+# --- Constants ---
+ACCOUNT_URL = "https://www.pracuj.pl/konto"
+LOGIN_URL = "https://login.pracuj.pl"
+SESSION_CHECK_TIMEOUT = 15
+SESSION_COOKIE_DOMAIN = "pracuj.pl"
+IGNORED_COOKIE_PREFIXES = ("_ga", "_gid", "_gcl", "_fbp", "_hj", "__cf", "cf_", "_dc_gtm")
+# The session is refreshed this long before its earliest cookie expires.
+REFRESH_MARGIN_SECONDS = 30 * 60
+# Longest sleep between expiry checks, so cookies saved by another login are noticed.
+REFRESH_CHECK_INTERVAL_SECONDS = 5 * 60
+MIN_REFRESH_INTERVAL_SECONDS = 10 * 60
+
 logger = SingletonLogger().get_logger()
 
 
+def session_expiry(cookies: List[Dict[str, Any]]) -> Optional[float]:
+    """
+    Earliest expiry among cookies of the site that carry the login. Browser-session
+    cookies have no expiry, and analytics or bot-protection cookies are short-lived
+    without logging anyone out, so neither counts.
+    """
+    expiries = [
+        cookie["expiry"]
+        for cookie in cookies
+        if cookie.get("expiry")
+        and cookie.get("domain", "").lstrip(".").endswith(SESSION_COOKIE_DOMAIN)
+        and not cookie["name"].startswith(IGNORED_COOKIE_PREFIXES)
+    ]
+    return min(expiries, default=None)
+
+
+def jar_to_cookies(jar: RequestsCookieJar) -> List[Dict[str, Any]]:
+    """Converts a requests cookie jar to cookies in Selenium's format, as they are stored."""
+    cookies = []
+    for cookie in jar:
+        stored = {
+            "name": cookie.name,
+            "value": cookie.value,
+            "domain": cookie.domain,
+            "path": cookie.path,
+            "secure": cookie.secure,
+        }
+        if cookie.expires is not None:
+            stored["expiry"] = cookie.expires
+        cookies.append(stored)
+    return cookies
+
+
+def add_cookies_to_jar(jar: RequestsCookieJar, cookies: List[Dict[str, Any]]) -> None:
+    """Copies cookies in Selenium's format into a requests cookie jar."""
+    for cookie in cookies:
+        jar.set(
+            cookie["name"],
+            cookie["value"],
+            domain=cookie.get("domain", ""),
+            path=cookie.get("path", "/"),
+            secure=cookie.get("secure", False),
+            expires=cookie.get("expiry"),
+        )
+
+
+def is_session_logged_in(session: requests.Session) -> bool:
+    """
+    Probes the account page over HTTP with the session's cookies. A logged-out session is
+    redirected to the login page. The probe goes around the session's cache and adapters,
+    so a cached account page cannot hide an expired login. Cookies the site renews in the
+    response are stored back into the session's jar.
+    """
+    probe = requests.Session()
+    probe.cookies = session.cookies
+    probe.headers.update(session.headers)
+    try:
+        with probe:
+            response = probe.get(ACCOUNT_URL, timeout=SESSION_CHECK_TIMEOUT)
+    except requests.exceptions.RequestException as e:
+        logger.warning(f"Couldnt check the session over HTTP: {e}")
+        return False
+    return response.ok and response.url.rstrip("/") == ACCOUNT_URL
+
+
 class CookieManager:
-    """Handles cookie operations for session persistence"""
+    """
+    Stores the session cookies of one user in `data/cookies/<username>_pracuj_cookies.json`.
+    Writes go to a temporary file that replaces the store in one step, so a crash never
+    leaves half a file. Cookies from the legacy pickle file are migrated on first load.
+    """
 
     def __init__(self, username):
         self.username = username
@@ -28,51 +114,46 @@ class CookieManager:
         )
 
     def save_cookies(self, cookies: List[Dict[str, Any]]) -> bool:
-        """Save cookies to both pickle and JSON files."""
-        if not os.path.isdir(self.cookies_dir):
-            try:
-                os.makedirs(self.cookies_dir)
-            except Exception as e:
-                logger.error(f"Failed to create directory for cookies: {e}")
-                return False
-
-        # Save to pickle file
-        try:
-            with open(self.cookies_file_pkl, "wb") as f:
-                pickle.dump(cookies, f)
-            logger.info(f"Cookies saved to {self.cookies_file_pkl}")
-        except Exception as e:
-            logger.error(f"Failed to save cookies to pickle file: {e}")
-            return False
-
-        # Save to JSON file
+        """Atomically replaces the stored cookies."""
         try:
-            with open(self.cookies_file_json, "w") as f:
-                json.dump(cookies, f, indent=4)
-            logger.info(f"Cookies saved to {self.cookies_file_json}")
-        except TypeError as e:
-            logger.error(f"Failed to serialize cookies to JSON: {e}")
-        except Exception as e:
-            logger.error(f"Failed to save cookies to JSON file: {e}")
+            os.makedirs(self.cookies_dir, exist_ok=True)
+            atomic_write_text(Path(self.cookies_file_json), json.dumps(cookies, indent=4))
+        except (OSError, TypeError) as e:
+            logger.error(f"Failed to save cookies to {self.cookies_file_json}: {e}")
             return False
-
+        logger.info(f"Cookies saved to {self.cookies_file_json}")
         return True
 
+    def _migrate_pickle(self) -> None:
+        with open(self.cookies_file_pkl, "rb") as f:
+            cookies = pickle.load(f)
+        if self.save_cookies(cookies):
+            os.remove(self.cookies_file_pkl)
+            logger.info(f"Migrated cookies from {self.cookies_file_pkl}")
+
     def load_cookies(self) -> Optional[List[Dict[str, Any]]]:
-        """Load cookies from pickle file"""
+        """Load cookies from the JSON store"""
         try:
             if os.path.exists(self.cookies_file_pkl):
-                with open(self.cookies_file_pkl, "rb") as f:
-                    cookies = pickle.load(f)
-                logger.info(f"Cookies loaded from {self.cookies_file_pkl}")
+                # The pickle was the file read before, so it wins over an older JSON copy.
+                self._migrate_pickle()
+            if os.path.exists(self.cookies_file_json):
+                with open(self.cookies_file_json, "r") as f:
+                    cookies = json.load(f)
+                # Read on every session refresh check, so this stays out of the info log.
+                logger.debug(f"Cookies loaded from {self.cookies_file_json}")
                 return cookies
             else:
-                logger.info("No cookies file found")
+                logger.debug("No cookies file found")
                 return None
         except Exception as e:
             logger.error(f"Failed to load cookies: {e}")
             return None
 
+    def expires_at(self) -> Optional[float]:
+        """Earliest expiry of the stored session cookies, or None if none is known."""
+        return session_expiry(self.load_cookies() or [])
+
 
 class PageNavigator:
     """Handles page navigation operations"""
@@ -172,7 +253,11 @@ class LoginElementInteractor:
 
 
 class PracujLogin:
-    """Handles login functionality for Pracuj.pl with cookie-based auto-login"""
+    """
+    Handles login functionality for Pracuj.pl with cookie-based auto-login.
+    The browser is started by `login`, so stored cookies can be checked over HTTP
+    with `check_session_over_http` before deciding whether one is needed at all.
+    """
 
     def __init__(
         self,
@@ -183,23 +268,45 @@ class PracujLogin:
         browser: str = "firefox",
     ):
         self.headless = headless
-        self.account_url = "https://www.pracuj.pl/konto"
-        self.login_url = "https://login.pracuj.pl"
+        self.account_url = ACCOUNT_URL
+        self.login_url = LOGIN_URL
         self.email = email
         self.password = password
         self.username = username
         self.browser = browser
+        self.cookie_manager = CookieManager(self.username)
+        self.cookies_verified = False
+        self.driver = None
+        self.wait = None
 
+    def _start_driver(self):
         if self.browser == "firefox":
             self.driver, self.wait = WebDriverInit(
                 self.headless
             ).create_firefox_driver()
         elif self.browser == "chrome":
             self.driver, self.wait = WebDriverInit(self.headless).create_chrome_driver()
-        self.cookie_manager = CookieManager(self.username)
         self.navigator = PageNavigator(self.driver, self.wait)
         self.element_interactor = LoginElementInteractor(self.driver, self.wait)
 
+    def check_session_over_http(self, session: requests.Session) -> bool:
+        """
+        Loads the stored cookies into `session` and checks them against the account page
+        without a browser. When they are valid, `session` is logged in and `login` only
+        has to hand the cookies to the browser.
+        """
+        cookies = self.cookie_manager.load_cookies()
+        if not cookies:
+            return False
+        add_cookies_to_jar(session.cookies, cookies)
+        self.cookies_verified = is_session_logged_in(session)
+        if not self.cookies_verified:
+            session.cookies.clear()
+        logger.info(
+            "Stored cookies are valid." if self.cookies_verified else "Stored cookies expired."
+        )
+        return self.cookies_verified
+
     def is_logged_in(self) -> bool:
         """
         Checks if the user is currently logged in by comparing the current URL
@@ -244,9 +351,16 @@ class PracujLogin:
             logger.error(f"Couldnt perform full login sequence: {e}")
             raise
 
-    def login(self):
+    def login(self, use_stored_cookies: bool = True):
+        """Starts the browser and logs it in, with the stored cookies when they still work."""
         try:
-            cookies = self.cookie_manager.load_cookies()
+            self._start_driver()
+            cookies = self.cookie_manager.load_cookies() if use_stored_cookies else None
+            if cookies and self.cookies_verified:
+                # Already checked over HTTP, so the account page does not need to be loaded.
+                self._apply_cookies(cookies)
+                logger.info("Logged in using cookies checked over HTTP.")
+                return self.driver, self.wait
             if cookies:
                 self._apply_cookies(cookies)
                 self.navigator.navigate_to(self.account_url)
@@ -284,3 +398,106 @@ class PracujLogin:
     def quit(self):
         if self.driver:
             self.driver.quit()
+            self.driver = None
+
+
+class SessionRefresher:
+    """
+    Keeps the stored session alive during long runs. A background thread wakes up
+    `margin` seconds before the earliest session cookie expires and first asks the site
+    to renew the cookies over HTTP. Only when that does not extend them does it log in
+    again in a separate headless browser. Renewed cookies are saved, put into the shared
+    `cookies` jar and passed to `on_renewed`, e.g. to update running browsers, so the main
+    run never waits for an interactive login.
+    """
+
+    def __init__(
+        self,
+        login: PracujLogin,
+        cookies: RequestsCookieJar,
+        margin: float = REFRESH_MARGIN_SECONDS,
+        on_renewed: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+    ):
+        self.login = login
+        self.cookies = cookies
+        self.margin = margin
+        self.on_renewed = on_renewed
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def _renew_over_http(self) -> Optional[List[Dict[str, Any]]]:
+        session = requests.Session()
+        session.cookies = self.cookies
+        if not is_session_logged_in(session):
+            return None
+        cookies = jar_to_cookies(self.cookies)
+        expiry = session_expiry(cookies)
+        if expiry is not None and expiry - time.time() <= self.margin:
+            return None
+        return cookies
+
+    def _renew_with_browser(self) -> Optional[List[Dict[str, Any]]]:
+        if not (self.login.email and self.login.password):
+            logger.warning("Credentials were not provided, the session cannot be renewed.")
+            return None
+        fresh_login = PracujLogin(
+            self.login.email, self.login.password, self.login.username, True, self.login.browser
+        )
+        try:
+            # The stored cookies still work inside the margin, so they would not be renewed.
+            driver, _ = fresh_login.login(use_stored_cookies=False)
+            cookies = driver.get_cookies()
+        except Exception as e:
+            logger.error(f"Background login failed: {e}")
+            return None
+        finally:
+            fresh_login.quit()
+        expiry = session_expiry(cookies)
+        if expiry is not None and expiry - time.time() <= self.margin:
+            logger.warning("Background login did not extend the session.")
+            return None
+        add_cookies_to_jar(self.cookies, cookies)
+        return cookies
+
+    def refresh(self) -> bool:
+        """Renews the session now; returns whether fresh cookies were saved."""
+        cookies = self._renew_over_http()
+        if cookies is not None:
+            logger.info("Session cookies renewed over HTTP.")
+        else:
+            logger.info("Session cookies could not be renewed over HTTP, logging in again.")
+            cookies = self._renew_with_browser()
+        if cookies is None:
+            return False
+        if self.on_renewed is not None:
+            self.on_renewed(cookies)
+        return self.login.cookie_manager.save_cookies(cookies)
+
+    def _run(self):
+        last_refresh = 0.0
+        while not self._stopped.is_set():
+            expiry = self.login.cookie_manager.expires_at()
+            now = time.time()
+            delay = REFRESH_CHECK_INTERVAL_SECONDS
+            if expiry is not None:
+                refresh_at = max(expiry - self.margin, last_refresh + MIN_REFRESH_INTERVAL_SECONDS)
+                if refresh_at <= now:
+                    self.refresh()
+                    last_refresh = time.time()
+                    continue
+                delay = min(delay, refresh_at - now)
+            self._stopped.wait(delay)
+
+    def start(self):
+        """Starts the background thread; call it once the run holds a valid session."""
+        if self._thread is None and not self._stopped.is_set():
+            self._thread = threading.Thread(
+                target=self._run, name="session-refresher", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,117 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from src.applier import Applier, ApplierConfig
+from src.index_scrapper import ScraperManager
+from src.logger import SingletonLogger
+from src.offer_ledger import OfferLedger
+from src.offer_parser import canonical_offer_id
+
+# --- Constants ---
+MAX_CONCURRENT_SEARCHES = 4
+PAGE_NUMBER_PARAM = "pn"
+
+logger = SingletonLogger().get_logger()
+
+
+def normalize_search_url(url: str) -> str:
+    """Canonical form of a filtered search URL, so identical filters in different configs compare equal."""
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key != PAGE_NUMBER_PARAM
+    )
+    return urlunsplit(
+        ("https", parts.netloc.lower(), parts.path.rstrip("/"), urlencode(query), "")
+    )
+
+
+class MultiSearchCrawler:
+    """
+    Crawls the filtered searches of several configs as one batch.
+    Each distinct search is scraped once, offers are deduplicated by canonical offer id,
+    and every profile receives the offers of its own searches.
+    """
+
+    def __init__(self, configs: list[ApplierConfig]):
+        self.configs = configs
+        self.searches = self._group_searches()
+
+    def _group_searches(self) -> dict[str, list[ApplierConfig]]:
+        searches: dict[str, list[ApplierConfig]] = {}
+        for config in self.configs:
+            searches.setdefault(normalize_search_url(config.filtered_job_url), []).append(
+                config
+            )
+        return searches
+
+    @staticmethod
+    def _shared_known_offer_ids(configs: list[ApplierConfig]) -> set[str] | None:
+        # A shared search may only stop early at offers that every profile has already seen.
+        if not all(config.incremental for config in configs):
+            return None
+        known_sets = [OfferLedger(config.username).finished_offer_ids() for config in configs]
+        return set.intersection(*known_sets)
+
+    def _scrape_search(self, search_url: str) -> list[str]:
+        configs = self.searches[search_url]
+        return ScraperManager(
+            search_url,
+            headless=configs[0].headless,
+            browser=configs[0].browser,
+            known_offer_ids=self._shared_known_offer_ids(configs),
+            overlap_pages=max(config.incremental_overlap_pages for config in configs),
+        ).run_scraper()
+
+    def crawl(self) -> dict[str, list[str]]:
+        """Returns the deduplicated offer URLs of every profile, keyed by username."""
+        offer_urls_by_id: dict[str, str] = {}
+        offer_ids_by_user: dict[str, dict[str, None]] = {
+            config.username: {} for config in self.configs
+        }
+        scraped_total = 0
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_SEARCHES) as executor:
+            futures = {
+                executor.submit(self._scrape_search, search_url): search_url
+                for search_url in self.searches
+            }
+            for future in as_completed(futures):
+                search_url = futures[future]
+                try:
+                    scraped_urls = future.result()
+                except Exception as e:
+                    logger.error(f"Couldnt scrape search {search_url}: {e}")
+                    continue
+                scraped_total += len(scraped_urls)
+                for url in scraped_urls:
+                    offer_id = canonical_offer_id(url)
+                    offer_urls_by_id.setdefault(offer_id, url)
+                    for config in self.searches[search_url]:
+                        offer_ids_by_user[config.username][offer_id] = None
+
+        fanned_out = sum(len(offer_ids) for offer_ids in offer_ids_by_user.values())
+        logger.info(
+            f"Crawled {len(self.searches)} distinct searches for {len(self.configs)} profiles: "
+            f"{scraped_total} offers scraped, {len(offer_urls_by_id)} unique, "
+            f"{fanned_out} assigned to profiles."
+        )
+        return {
+            username: [offer_urls_by_id[offer_id] for offer_id in offer_ids]
+            for username, offer_ids in offer_ids_by_user.items()
+        }
+
+    def run(self):
+        """Crawls each distinct search once, then applies for every profile with its offers."""
+        offers_by_user = self.crawl()
+        for config in self.configs:
+            logger.info(
+                f"Applying for '{config.username}' to {len(offers_by_user[config.username])} offers."
+            )
+            applier = Applier(config)
+            try:
+                applier.apply(offer_urls=offers_by_user[config.username])
+            except Exception as e:
+                logger.error(f"Batch run for '{config.username}' failed: {e}")
+            finally:
+                applier.close()
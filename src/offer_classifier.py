@@ -0,0 +1,161 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Iterable, Iterator, Optional
+from urllib.parse import urlsplit
+
+import requests
+from pydantic import BaseModel
+
+from src.index_scrapper import HTTP_POOL_SIZE, REQUEST_TIMEOUT, create_http_session
+from src.logger import SingletonLogger
+from src.offer_parser import (
+    canonicalize_offer_url,
+    find_first,
+    load_next_data,
+    page_has_selector,
+)
+from src.page_selectors import (
+    ALREADY_APPLIED_MARKERS,
+    EXPIRED_OFFER_MARKERS,
+    FAST_APPLY_SELECTOR,
+    NORMAL_APPLY_SELECTOR,
+)
+
+# --- Constants ---
+ONE_CLICK_APPLY_KEYS = ("oneClickApply", "isOneClickApply")
+APPLY_URL_KEYS = ("applyURL", "applyUrl", "applicationUrl")
+EXPIRED_KEYS = ("isExpired", "expired")
+EXPIRATION_DATE_KEYS = ("expirationDate", "expirationDateUtc")
+APPLIED_KEYS = ("isApplied", "hasApplied", "alreadyApplied")
+PRACUJ_HOST_SUFFIX = "pracuj.pl"
+
+logger = SingletonLogger().get_logger()
+
+
+class OfferVerdict(str, Enum):
+    FAST_APPLY = "fast_apply"
+    EXTERNAL = "external"
+    EXPIRED = "expired"
+    ALREADY_APPLIED = "already_applied"
+    NO_APPLY = "no_apply"
+    UNKNOWN = "unknown"
+
+
+# Offers with these verdicts never need the logged-in driver.
+SKIPPED_VERDICTS = (OfferVerdict.EXPIRED, OfferVerdict.ALREADY_APPLIED)
+
+
+class OfferClassification(BaseModel):
+    url: str
+    verdict: OfferVerdict
+    external_url: Optional[str] = None
+
+    @property
+    def needs_driver(self) -> bool:
+        """
+        Fast apply has to be clicked while logged in; external offers need the driver only
+        when the page does not reveal the target form's URL. Unknown pages, and pages whose
+        apply button was not recognised, fall back to clicking.
+        """
+        if self.verdict in SKIPPED_VERDICTS:
+            return False
+        return not (self.verdict == OfferVerdict.EXTERNAL and self.external_url)
+
+
+def _is_past(timestamp: str) -> bool:
+    try:
+        expires_at = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except ValueError:
+        return False
+    if expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    return expires_at < datetime.now(timezone.utc)
+
+
+def _is_external_target(url: Optional[str]) -> bool:
+    if not url or not url.startswith("http"):
+        return False
+    host = urlsplit(url).hostname or ""
+    return not host.endswith(PRACUJ_HOST_SUFFIX)
+
+
+def classify_offer_page(url: str, page_source: str) -> OfferClassification:
+    """Decides how an offer is applied to from its embedded state, falling back to page markers."""
+    state = load_next_data(page_source)
+    if state is not None:
+        if find_first(state, *APPLIED_KEYS) is True:
+            return OfferClassification(url=url, verdict=OfferVerdict.ALREADY_APPLIED)
+        expiration_date = find_first(state, *EXPIRATION_DATE_KEYS)
+        if find_first(state, *EXPIRED_KEYS) is True or (
+            isinstance(expiration_date, str) and _is_past(expiration_date)
+        ):
+            return OfferClassification(url=url, verdict=OfferVerdict.EXPIRED)
+        one_click_apply = find_first(state, *ONE_CLICK_APPLY_KEYS)
+        apply_url = find_first(state, *APPLY_URL_KEYS)
+        if one_click_apply is True:
+            return OfferClassification(url=url, verdict=OfferVerdict.FAST_APPLY)
+        if one_click_apply is False:
+            return OfferClassification(
+                url=url,
+                verdict=OfferVerdict.EXTERNAL,
+                external_url=apply_url if _is_external_target(apply_url) else None,
+            )
+
+    if any(marker in page_source for marker in ALREADY_APPLIED_MARKERS):
+        return OfferClassification(url=url, verdict=OfferVerdict.ALREADY_APPLIED)
+    if any(marker in page_source for marker in EXPIRED_OFFER_MARKERS):
+        return OfferClassification(url=url, verdict=OfferVerdict.EXPIRED)
+    if page_has_selector(page_source, FAST_APPLY_SELECTOR):
+        return OfferClassification(url=url, verdict=OfferVerdict.FAST_APPLY)
+    if page_has_selector(page_source, NORMAL_APPLY_SELECTOR):
+        return OfferClassification(url=url, verdict=OfferVerdict.EXTERNAL)
+    return OfferClassification(url=url, verdict=OfferVerdict.NO_APPLY)
+
+
+class OfferClassifier:
+    """
+    Fetches offer pages concurrently over HTTP and classifies each one, so the logged-in
+    Selenium driver only visits offers that actually need a click.
+    """
+
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        max_workers: int = HTTP_POOL_SIZE,
+    ):
+        self.session = session or create_http_session()
+        self.max_workers = max_workers
+
+    def classify(self, url: str) -> OfferClassification:
+        try:
+            response = self.session.get(
+                canonicalize_offer_url(url), timeout=REQUEST_TIMEOUT
+            )
+            response.raise_for_status()
+        except requests.exceptions.RequestException as req_err:
+            logger.warning(f"Couldnt fetch offer {url} for classification: {req_err}")
+            return OfferClassification(url=url, verdict=OfferVerdict.UNKNOWN)
+        classification = classify_offer_page(url, response.text)
+        logger.debug(f"Classified {url} as {classification.verdict.value}")
+        return classification
+
+    def iter_classified(self, offer_urls: Iterable[str]) -> Iterator[OfferClassification]:
+        """
+        Yields classifications as pages complete. Offers are pulled from `offer_urls` only
+        as fast as they are classified, so an upstream stream keeps its backpressure.
+        """
+        pending_urls = iter(offer_urls)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            in_flight = set()
+            for url in pending_urls:
+                in_flight.add(executor.submit(self.classify, url))
+                if len(in_flight) >= self.max_workers:
+                    break
+            while in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+                    next_url = next(pending_urls, None)
+                    if next_url:
+                        in_flight.add(executor.submit(self.classify, next_url))
@@ -0,0 +1,181 @@
+import sqlite3
+from datetime import datetime, timezone
+from enum import Enum
+from pathlib import Path
+from typing import ContextManager, Optional
+
+from src.logger import SingletonLogger
+from src.storage import connect_sqlite, init_sqlite
+from src.offer_parser import canonical_offer_id
+
+# --- Constants ---
+BASE_DIR = Path(__file__).resolve().parent.parent
+LEDGER_PATH = BASE_DIR / "data" / "ledger.sqlite"
+MAX_ATTEMPTS = 3
+
+logger = SingletonLogger().get_logger()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS offers (
+    username TEXT NOT NULL,
+    offer_id TEXT NOT NULL,
+    url TEXT NOT NULL,
+    state TEXT NOT NULL,
+    external_url TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (username, offer_id)
+)
+"""
+
+
+class OfferState(str, Enum):
+    SCRAPED = "scraped"
+    CLASSIFIED = "classified"
+    FAST_APPLIED = "fast_applied"
+    EXTERNAL_QUEUED = "external_queued"
+    AGENT_APPLIED = "agent_applied"
+    SKIPPED = "skipped"
+    FAILED = "failed"
+
+
+# Skipped offers (expired or already applied) need no further work either.
+COMPLETED_STATES = (OfferState.FAST_APPLIED, OfferState.AGENT_APPLIED, OfferState.SKIPPED)
+# States that need no more work on pracuj.pl; failed offers join them after MAX_ATTEMPTS.
+DONE_STATES = (*COMPLETED_STATES, OfferState.EXTERNAL_QUEUED)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class OfferLedger:
+    """
+    Persistent per-user record of every offer seen across runs, stored in SQLite.
+    Each call opens its own connection so the ledger can be shared by threads and
+    pickled into worker processes.
+    """
+
+    def __init__(self, username: str, path: Path = LEDGER_PATH):
+        self.username = username
+        self.path = Path(path)
+        init_sqlite(self.path, SCHEMA)
+
+    def _connect(self) -> ContextManager[sqlite3.Connection]:
+        return connect_sqlite(self.path, row_factory=sqlite3.Row)
+
+    def get_state(self, offer_id: str) -> Optional[OfferState]:
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT state FROM offers WHERE username = ? AND offer_id = ?",
+                (self.username, offer_id),
+            ).fetchone()
+        return OfferState(row["state"]) if row else None
+
+    def is_done(self, offer_id: str) -> bool:
+        """
+        True when the offer needs no more work on pracuj.pl in this run: it was applied to,
+        is already queued for the agent, or failed too many times.
+        """
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT state, attempts FROM offers WHERE username = ? AND offer_id = ?",
+                (self.username, offer_id),
+            ).fetchone()
+        if row is None:
+            return False
+        state = OfferState(row["state"])
+        if state == OfferState.FAILED:
+            return row["attempts"] >= MAX_ATTEMPTS
+        return state in DONE_STATES
+
+    def finished_offer_ids(self) -> set[str]:
+        """
+        Offers `is_done` would skip. Offers left scraped, classified or retryably failed
+        by an interrupted run are excluded, so an incremental crawl streams them again.
+        """
+        placeholders = ", ".join("?" for _ in DONE_STATES)
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT offer_id FROM offers WHERE username = ? AND "
+                f"(state IN ({placeholders}) OR (state = ? AND attempts >= ?))",
+                (
+                    self.username,
+                    *(state.value for state in DONE_STATES),
+                    OfferState.FAILED.value,
+                    MAX_ATTEMPTS,
+                ),
+            ).fetchall()
+        return {row["offer_id"] for row in rows}
+
+    def record_scraped(self, url: str) -> str:
+        """Adds a newly scraped offer without touching offers already in the ledger."""
+        offer_id = canonical_offer_id(url)
+        timestamp = _now()
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR IGNORE INTO offers "
+                "(username, offer_id, url, state, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self.username, offer_id, url, OfferState.SCRAPED.value, timestamp, timestamp),
+            )
+        return offer_id
+
+    def set_state(
+        self,
+        offer_id: str,
+        state: OfferState,
+        external_url: Optional[str] = None,
+        error: Optional[str] = None,
+    ):
+        """`error` is stored as the reason for failed and skipped offers."""
+        attempts_increment = 1 if state == OfferState.FAILED else 0
+        with self._connect() as connection:
+            connection.execute(
+                "UPDATE offers SET state = ?, "
+                "external_url = COALESCE(?, external_url), "
+                "attempts = attempts + ?, last_error = ?, updated_at = ? "
+                "WHERE username = ? AND offer_id = ?",
+                (
+                    state.value,
+                    external_url,
+                    attempts_increment,
+                    error,
+                    _now(),
+                    self.username,
+                    offer_id,
+                ),
+            )
+        logger.debug(f"Offer {offer_id} -> {state.value}")
+
+    def set_state_by_external_url(
+        self, external_url: str, state: OfferState, error: Optional[str] = None
+    ):
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT offer_id FROM offers WHERE username = ? AND external_url = ?",
+                (self.username, external_url),
+            ).fetchone()
+        if row:
+            self.set_state(row["offer_id"], state, error=error)
+
+    def pending_external_urls(self) -> list[str]:
+        """External application URLs still waiting for the agent, including ones left by a crashed run."""
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT external_url FROM offers "
+                "WHERE username = ? AND state = ? AND external_url IS NOT NULL "
+                "ORDER BY updated_at",
+                (self.username, OfferState.EXTERNAL_QUEUED.value),
+            ).fetchall()
+        return [row["external_url"] for row in rows]
+
+    def summary(self) -> dict[str, int]:
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT state, COUNT(*) AS total FROM offers WHERE username = ? GROUP BY state",
+                (self.username,),
+            ).fetchall()
+        return {row["state"]: row["total"] for row in rows}
@@ -0,0 +1,312 @@
+import json
+import re
+from enum import Enum
+from typing import Any, Callable, Iterable, Iterator, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+from bs4 import BeautifulSoup
+from pydantic import BaseModel
+
+from src.logger import SingletonLogger
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    HTMLParser = None
+
+try:
+    from lxml import html as lxml_html
+except ImportError:
+    lxml_html = None
+
+# --- Constants ---
+NEXT_DATA_PATTERN = re.compile(
+    r'<script[^>]*id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.DOTALL
+)
+OFFER_ID_PATTERN = re.compile(r",oferta,(\d+)")
+PROMOTED_URL_MARKER = "boosterAI"
+CANONICAL_SCHEME = "https"
+OFFER_LINK_SELECTOR = '[data-test="link-offer"]'
+MAX_PAGE_SELECTOR = 'span[data-test="top-pagination-max-page-number"]'
+DYNAMIC_BUTTON_SELECTOR = 'div[class="tiles_cobg3mp"][tabindex="0"][role="button"]'
+MAX_PAGE_KEYS = ("maxPage", "totalPages", "pagesCount")
+
+logger = SingletonLogger().get_logger()
+
+
+# --- Pydantic Models ---
+class ApplyType(str, Enum):
+    FAST = "fast"
+    EXTERNAL = "external"
+    UNKNOWN = "unknown"
+
+
+class OfferRecord(BaseModel):
+    """A job offer as listed on pracuj.pl."""
+
+    url: str
+    offer_id: Optional[str] = None
+    title: Optional[str] = None
+    company: Optional[str] = None
+    location: Optional[str] = None
+    posted_at: Optional[str] = None
+    apply_type: ApplyType = ApplyType.UNKNOWN
+    promoted: bool = False
+
+
+class ListingPage(BaseModel):
+    """Everything extracted from one listing page."""
+
+    offers: list[OfferRecord] = []
+    max_page: int = 1
+    has_hidden_offers: bool = False
+    backend: str = ""
+
+    @property
+    def offer_urls(self) -> list[str]:
+        return [offer.url for offer in self.offers]
+
+
+# --- Helpers ---
+def extract_offer_id(url: str) -> Optional[str]:
+    """Returns the numeric id pracuj.pl puts after `,oferta,` in offer URLs."""
+    match = OFFER_ID_PATTERN.search(url)
+    return match.group(1) if match else None
+
+
+def canonicalize_offer_url(url: str) -> str:
+    """
+    Normalizes an offer URL so every listing variant of the same offer compares equal.
+    Offer URLs carry the offer id in the path; the query only holds tracking and promotion
+    parameters (e.g. `s=`, `searchId=`, boosterAI suggestions), so it is dropped.
+    """
+    parts = urlsplit(url.strip())
+    return urlunsplit(
+        (CANONICAL_SCHEME, parts.netloc.lower(), parts.path.rstrip("/"), "", "")
+    )
+
+
+def canonical_offer_id(url: str) -> str:
+    """Offer id from the URL, or the canonical URL without scheme when it has none."""
+    offer_id = extract_offer_id(url)
+    if offer_id:
+        return offer_id
+    parts = urlsplit(canonicalize_offer_url(url))
+    return f"{parts.netloc}{parts.path}"
+
+
+def dedupe_offers(offers: Iterable[OfferRecord]) -> list[OfferRecord]:
+    """
+    Keeps one record per canonical offer id, in first-seen order.
+    Promoted placements repeat regular offers, so a duplicate only contributes its promoted flag.
+    """
+    unique_offers: dict[str, OfferRecord] = {}
+    for offer in offers:
+        offer_id = canonical_offer_id(offer.url)
+        if offer_id in unique_offers:
+            unique_offers[offer_id].promoted |= offer.promoted
+        else:
+            unique_offers[offer_id] = offer
+    return list(unique_offers.values())
+
+
+def _walk(node: Any) -> Iterator[dict]:
+    """Yields every dict nested anywhere inside a decoded JSON document."""
+    if isinstance(node, dict):
+        yield node
+        for value in node.values():
+            yield from _walk(value)
+    elif isinstance(node, list):
+        for item in node:
+            yield from _walk(item)
+
+
+def find_first(node: Any, *keys: str) -> Any:
+    """Returns the first value stored under any of `keys`, searching depth-first."""
+    for candidate in _walk(node):
+        for key in keys:
+            if candidate.get(key) is not None:
+                return candidate[key]
+    return None
+
+
+def load_next_data(page_source: str) -> Optional[dict]:
+    """Decodes the `__NEXT_DATA__` state embedded in pracuj.pl pages, if present."""
+    match = NEXT_DATA_PATTERN.search(page_source)
+    if not match:
+        return None
+    try:
+        return json.loads(match.group(1))
+    except json.JSONDecodeError as e:
+        logger.debug(f"Embedded page state is not valid JSON: {e}")
+        return None
+
+
+def _offer_from_dom_link(href: str, title: Optional[str]) -> OfferRecord:
+    return OfferRecord(
+        url=canonicalize_offer_url(href),
+        offer_id=extract_offer_id(href),
+        title=title or None,
+        promoted=PROMOTED_URL_MARKER in href,
+    )
+
+
+# --- Backends ---
+def _parse_listing_json(page_source: str) -> Optional[ListingPage]:
+    """
+    Builds records from the grouped offers in the embedded state. Offers with several
+    locations are all present there, so no dynamic buttons have to be clicked.
+    """
+    state = load_next_data(page_source)
+    if state is None:
+        return None
+    grouped_offers = find_first(state, "groupedOffers")
+    if not grouped_offers:
+        return None
+
+    offers = []
+    for group in grouped_offers:
+        apply_type = (
+            ApplyType.FAST if group.get("isOneClickApply") else ApplyType.EXTERNAL
+        )
+        for offer in group.get("offers") or []:
+            url = offer.get("offerAbsoluteUri")
+            if not url:
+                continue
+            offers.append(
+                OfferRecord(
+                    url=canonicalize_offer_url(url),
+                    offer_id=extract_offer_id(url) or str(offer.get("partitionId")),
+                    title=group.get("jobTitle"),
+                    company=group.get("companyName"),
+                    location=offer.get("displayWorkplace"),
+                    posted_at=group.get("lastPublicated"),
+                    apply_type=apply_type,
+                    promoted=bool(group.get("isSuperOffer")),
+                )
+            )
+
+    max_page = find_first(state, *MAX_PAGE_KEYS)
+    if not isinstance(max_page, int):
+        max_page = _parse_listing_dom(page_source).max_page
+    return ListingPage(offers=dedupe_offers(offers), max_page=max_page, backend="json")
+
+
+def _parse_listing_selectolax(page_source: str) -> ListingPage:
+    tree = HTMLParser(page_source)
+    offers = dedupe_offers(
+        _offer_from_dom_link(node.attributes["href"], node.text(strip=True))
+        for node in tree.css(OFFER_LINK_SELECTOR)
+        if node.attributes.get("href")
+    )
+    max_page_node = tree.css_first(MAX_PAGE_SELECTOR)
+    return ListingPage(
+        offers=offers,
+        max_page=int(max_page_node.text(strip=True)) if max_page_node else 1,
+        has_hidden_offers=tree.css_first(DYNAMIC_BUTTON_SELECTOR) is not None,
+        backend="selectolax",
+    )
+
+
+def _parse_listing_lxml(page_source: str) -> ListingPage:
+    tree = lxml_html.fromstring(page_source)
+    offers = dedupe_offers(
+        _offer_from_dom_link(element.get("href"), element.text_content().strip())
+        for element in tree.xpath('//*[@data-test="link-offer"]')
+        if element.get("href")
+    )
+    max_page_text = tree.xpath(
+        'string(//span[@data-test="top-pagination-max-page-number"])'
+    ).strip()
+    hidden_offer_buttons = tree.xpath(
+        "//div[@class='tiles_cobg3mp' and @tabindex='0' and @role='button']"
+    )
+    return ListingPage(
+        offers=offers,
+        max_page=int(max_page_text) if max_page_text else 1,
+        has_hidden_offers=bool(hidden_offer_buttons),
+        backend="lxml",
+    )
+
+
+def _parse_listing_bs4(page_source: str) -> ListingPage:
+    soup = BeautifulSoup(page_source, "html.parser")
+    offers = dedupe_offers(
+        _offer_from_dom_link(link["href"], link.get_text(strip=True))
+        for link in soup.select(OFFER_LINK_SELECTOR)
+        if link.get("href")
+    )
+    max_page_element = soup.select_one(MAX_PAGE_SELECTOR)
+    return ListingPage(
+        offers=offers,
+        max_page=int(max_page_element.text.strip()) if max_page_element else 1,
+        has_hidden_offers=soup.select_one(DYNAMIC_BUTTON_SELECTOR) is not None,
+        backend="bs4",
+    )
+
+
+def _available_dom_backends() -> dict[str, Callable[[str], ListingPage]]:
+    backends = {}
+    if HTMLParser is not None:
+        backends["selectolax"] = _parse_listing_selectolax
+    if lxml_html is not None:
+        backends["lxml"] = _parse_listing_lxml
+    backends["bs4"] = _parse_listing_bs4
+    return backends
+
+
+def _parse_listing_dom(page_source: str) -> ListingPage:
+    """Parses the rendered DOM with the fastest installed parser."""
+    return next(iter(_available_dom_backends().values()))(page_source)
+
+
+LISTING_BACKENDS: dict[str, Callable[[str], Optional[ListingPage]]] = {
+    "json": _parse_listing_json,
+    **_available_dom_backends(),
+}
+
+
+def page_has_selector(page_source: str, selector: str) -> bool:
+    """Checks a CSS selector against raw HTML with the fastest installed parser."""
+    if HTMLParser is not None:
+        return HTMLParser(page_source).css_first(selector) is not None
+    return BeautifulSoup(page_source, "html.parser").select_one(selector) is not None
+
+
+# --- Public API ---
+def parse_listing(page_source: str, backend: str = "auto") -> ListingPage:
+    """
+    Extracts offers and pagination from a listing page.
+    `auto` reads the embedded JSON state and falls back to DOM parsing
+    (selectolax, then lxml, then BeautifulSoup) when the state is missing.
+    """
+    if backend != "auto":
+        return LISTING_BACKENDS[backend](page_source) or ListingPage(backend=backend)
+
+    listing = _parse_listing_json(page_source)
+    if listing is not None:
+        return listing
+    logger.debug("No embedded offer state found, falling back to DOM parsing.")
+    return _parse_listing_dom(page_source)
+
+
+def parse_offer_page(page_source: str, url: str) -> OfferRecord:
+    """Extracts the offer record from the embedded state of a single offer page."""
+    record = OfferRecord(url=canonicalize_offer_url(url), offer_id=extract_offer_id(url))
+    state = load_next_data(page_source)
+    if state is None:
+        return record
+
+    one_click_apply = find_first(state, "oneClickApply", "isOneClickApply")
+    if one_click_apply is not None:
+        record.apply_type = (
+            ApplyType.FAST if one_click_apply else ApplyType.EXTERNAL
+        )
+    record.title = find_first(state, "jobTitle")
+    record.company = find_first(state, "displayEmployerName", "companyName")
+    record.location = find_first(state, "displayAddress", "displayWorkplace")
+    record.posted_at = find_first(
+        state, "dateOfInitialPublication", "lastPublicated"
+    )
+    record.promoted = bool(find_first(state, "isSuperOffer"))
+    return record
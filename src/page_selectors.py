@@ -0,0 +1,17 @@
+# --- Constants ---
+# Selectors and text markers of pracuj.pl offer pages, shared by the Selenium clicker
+# and the HTTP classifier so both read the page the same way.
+FAST_APPLY_SELECTOR = ".quick-apply_s1i8itcr > a:nth-child(2)"
+NORMAL_APPLY_SELECTOR = ".quick-apply_s47rwpe > div:nth-child(1) > a:nth-child(1)"
+CONTINUE_BUTTON_SELECTOR = "button.ui-library_b14qiyz3:nth-child(1)"
+
+EXPIRED_OFFER_MARKERS = (
+    "Ta oferta wygasła",
+    "Oferta wygasła",
+    "Ogłoszenie jest już nieaktualne",
+)
+ALREADY_APPLIED_MARKERS = (
+    "Już aplikowałeś",
+    "Aplikowałeś na tę ofertę",
+    "Twoja aplikacja została wysłana",
+)
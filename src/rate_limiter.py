@@ -0,0 +1,233 @@
+import os
+import random
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+from urllib.parse import urlsplit
+
+from pydantic import BaseModel
+from requests import PreparedRequest, Response
+from requests.adapters import HTTPAdapter
+
+from src.logger import SingletonLogger
+from src.storage import atomic_write_text
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+# --- Constants ---
+BASE_DIR = Path(__file__).resolve().parent.parent
+RATE_LIMIT_DIR = BASE_DIR / "data" / "rate_limits"
+THROTTLE_STATUS_CODES = (403, 429, 503)
+# Only found on challenge pages; a bare "captcha" would also match reCAPTCHA script tags
+# embedded in ordinary pages.
+INTERSTITIAL_MARKERS = (
+    "cf-challenge",
+    "_cf_chl_opt",
+    "<title>Just a moment...</title>",
+    "<title>Attention Required! | Cloudflare</title>",
+)
+MAX_THROTTLE_RETRIES = 3
+RETRY_AFTER_HEADER = "Retry-After"
+
+logger = SingletonLogger().get_logger()
+
+
+class HostLimits(BaseModel):
+    """
+    AIMD tuning for one host. The request rate grows by `additive_increase` per fast
+    success and is multiplied by `multiplicative_decrease` on throttling; responses slower
+    than `target_latency` shrink it by the gentler `slowdown_decrease`.
+    """
+
+    initial_rate: float = 2.0
+    min_rate: float = 0.2
+    max_rate: float = 8.0
+    burst: float = 4.0
+    additive_increase: float = 0.1
+    multiplicative_decrease: float = 0.5
+    slowdown_decrease: float = 0.9
+    target_latency: float = 2.0
+    base_backoff: float = 2.0
+    max_backoff: float = 120.0
+
+
+HOST_LIMITS = {
+    "www.pracuj.pl": HostLimits(),
+    "login.pracuj.pl": HostLimits(initial_rate=0.5, max_rate=1.0, burst=1.0),
+}
+DEFAULT_HOST_LIMITS = HostLimits()
+
+
+class HostState(BaseModel):
+    rate: float
+    tokens: float
+    last_refill: float
+    backoff_until: float = 0.0
+    consecutive_throttles: int = 0
+
+
+@contextmanager
+def _exclusive_lock(lock_path: Path) -> Iterator[None]:
+    """Cross-process lock held on a sidecar file, so threads and pool workers share one bucket."""
+    with open(lock_path, "a+") as lock_file:
+        if os.name == "nt":
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == "nt":
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def is_throttled(status_code: Optional[int], body: str = "") -> bool:
+    """True for rate-limit status codes and anti-bot interstitial pages."""
+    if status_code in THROTTLE_STATUS_CODES:
+        return True
+    return any(marker in body for marker in INTERSTITIAL_MARKERS)
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket per host whose state lives in `data/rate_limits/<host>.json`, guarded by
+    a file lock, so every thread and process scraping the same host draws from one budget.
+    The refill rate adapts AIMD-style to observed latency and throttling, and throttling
+    also triggers a jittered exponential backoff that blocks all callers.
+    """
+
+    def __init__(
+        self,
+        state_dir: Path = RATE_LIMIT_DIR,
+        host_limits: Optional[dict[str, HostLimits]] = None,
+    ):
+        self.state_dir = Path(state_dir)
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        self.host_limits = {**HOST_LIMITS, **(host_limits or {})}
+
+    def limits_for(self, host: str) -> HostLimits:
+        return self.host_limits.get(host, DEFAULT_HOST_LIMITS)
+
+    def _state_path(self, host: str) -> Path:
+        return self.state_dir / f"{host}.json"
+
+    def _load_state(self, host: str) -> HostState:
+        try:
+            return HostState.model_validate_json(self._state_path(host).read_text())
+        except (FileNotFoundError, ValueError):
+            limits = self.limits_for(host)
+            return HostState(
+                rate=limits.initial_rate, tokens=limits.burst, last_refill=time.time()
+            )
+
+    def _save_state(self, host: str, state: HostState):
+        atomic_write_text(self._state_path(host), state.model_dump_json())
+
+    @contextmanager
+    def _host_state(self, host: str) -> Iterator[HostState]:
+        with _exclusive_lock(self._state_path(host).with_suffix(".lock")):
+            state = self._load_state(host)
+            yield state
+            self._save_state(host, state)
+
+    def acquire(self, host: str):
+        """Blocks until `host` may receive another request."""
+        limits = self.limits_for(host)
+        while True:
+            with self._host_state(host) as state:
+                now = time.time()
+                state.tokens = min(
+                    limits.burst, state.tokens + (now - state.last_refill) * state.rate
+                )
+                state.last_refill = now
+                if now < state.backoff_until:
+                    wait_seconds = state.backoff_until - now
+                elif state.tokens >= 1:
+                    state.tokens -= 1
+                    return
+                else:
+                    wait_seconds = (1 - state.tokens) / state.rate
+            time.sleep(wait_seconds)
+
+    def report(
+        self,
+        host: str,
+        latency: float,
+        throttled: bool,
+        retry_after: Optional[float] = None,
+    ):
+        """Feeds one response back into the AIMD controller of `host`."""
+        limits = self.limits_for(host)
+        with self._host_state(host) as state:
+            if throttled:
+                state.consecutive_throttles += 1
+                state.rate = max(limits.min_rate, state.rate * limits.multiplicative_decrease)
+                backoff_cap = min(
+                    limits.max_backoff,
+                    limits.base_backoff * 2 ** (state.consecutive_throttles - 1),
+                )
+                # Full jitter keeps the workers that were throttled together from retrying together.
+                backoff = max(retry_after or 0.0, random.uniform(0, backoff_cap))
+                state.backoff_until = max(state.backoff_until, time.time() + backoff)
+                logger.warning(
+                    f"{host} is throttling us, rate {state.rate:.2f} req/s, "
+                    f"backing off {backoff:.1f}s"
+                )
+            elif latency > limits.target_latency:
+                state.consecutive_throttles = 0
+                state.rate = max(limits.min_rate, state.rate * limits.slowdown_decrease)
+            else:
+                state.consecutive_throttles = 0
+                state.rate = min(limits.max_rate, state.rate + limits.additive_increase)
+
+
+def _parse_retry_after(response: Response) -> Optional[float]:
+    value = response.headers.get(RETRY_AFTER_HEADER)
+    if value and value.isdigit():
+        return float(value)
+    return None
+
+
+class RateLimitedHTTPAdapter(HTTPAdapter):
+    """Transport adapter that paces network sends through an AdaptiveRateLimiter and retries throttled ones."""
+
+    def __init__(self, *args, limiter: AdaptiveRateLimiter, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.limiter = limiter
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        host = urlsplit(request.url).hostname or ""
+        for attempt in range(MAX_THROTTLE_RETRIES + 1):
+            self.limiter.acquire(host)
+            started = time.monotonic()
+            response = super().send(request, **kwargs)
+            throttled = is_throttled(response.status_code, response.text)
+            self.limiter.report(
+                host,
+                time.monotonic() - started,
+                throttled,
+                retry_after=_parse_retry_after(response),
+            )
+            if not throttled or attempt == MAX_THROTTLE_RETRIES:
+                return response
+            response.close()
+        return response
+
+
+_default_limiter: Optional[AdaptiveRateLimiter] = None
+
+
+def default_rate_limiter() -> AdaptiveRateLimiter:
+    """Limiter over the shared state directory; instances in different processes cooperate through it."""
+    global _default_limiter
+    if _default_limiter is None:
+        _default_limiter = AdaptiveRateLimiter()
+    return _default_limiter
@@ -0,0 +1,46 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+# --- Constants ---
+SQLITE_BUSY_TIMEOUT_SECONDS = 30
+
+
+@contextmanager
+def connect_sqlite(
+    path: Path, row_factory: Optional[Callable[..., Any]] = None
+) -> Iterator[sqlite3.Connection]:
+    """
+    Opens one connection for one unit of work, committed on success and closed afterwards,
+    so the stores built on it can be shared by threads and pickled into worker processes.
+    """
+    connection = sqlite3.connect(path, timeout=SQLITE_BUSY_TIMEOUT_SECONDS)
+    connection.row_factory = row_factory
+    try:
+        with connection:
+            yield connection
+    finally:
+        connection.close()
+
+
+def init_sqlite(path: Path, schema: str):
+    """Creates the database file in WAL mode, so readers are not blocked by a writer."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with connect_sqlite(path) as connection:
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(schema)
+
+
+def atomic_write_text(path: Path, text: str):
+    """Writes a temporary file that replaces `path` in one step; a crash never leaves half a file."""
+    path = Path(path)
+    temporary_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        temporary_path.write_text(text)
+        os.replace(temporary_path, path)
+    except OSError:
+        temporary_path.unlink(missing_ok=True)
+        raise
@@ -0,0 +1,20 @@
+import pytest
+
+from src import http_cache, rate_limiter
+from src.http_cache import HttpCache
+from src.offer_ledger import OfferLedger
+from src.rate_limiter import AdaptiveRateLimiter
+
+
+@pytest.fixture(autouse=True)
+def isolated_http_state(tmp_path, monkeypatch):
+    """Keeps the shared HTTP cache and rate-limit state of every test out of `data/`."""
+    monkeypatch.setattr(http_cache, "_default_cache", HttpCache(path=tmp_path / "http.sqlite"))
+    monkeypatch.setattr(
+        rate_limiter, "_default_limiter", AdaptiveRateLimiter(state_dir=tmp_path / "rate_limits")
+    )
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    return OfferLedger("tester", path=tmp_path / "ledger.sqlite")
@@ -0,0 +1,18 @@
+from src.index_scrapper import ListingPageResult
+from src.offer_parser import OfferRecord
+
+OFFER_URL = "https://www.pracuj.pl/praca/python-developer-warszawa,oferta,{}"
+
+
+def offer(offer_id: int, promoted: bool = False) -> OfferRecord:
+    return OfferRecord(url=OFFER_URL.format(offer_id), promoted=promoted)
+
+
+def listing_page(page_num: int, offer_ids=(), max_page=None, needs_browser=False):
+    return ListingPageResult(
+        url=f"https://www.pracuj.pl/praca?pn={page_num}",
+        page_num=page_num,
+        max_page=max_page,
+        offers=[offer(offer_id) for offer_id in offer_ids],
+        needs_browser=needs_browser,
+    )
@@ -0,0 +1,75 @@
+import pytest
+from requests import PreparedRequest, Request, Response
+from requests.adapters import HTTPAdapter
+
+from src.http_cache import CachingHTTPAdapter, HttpCache
+from src.rate_limiter import is_throttled
+from tests.helpers import OFFER_URL
+
+CHALLENGE_PAGE = "<html><head><title>Just a moment...</title></head></html>"
+RECAPTCHA_PAGE = (
+    '<html><script src="https://www.google.com/recaptcha/api.js"></script>'
+    '<div class="g-recaptcha"></div></html>'
+)
+
+
+class StubAdapter(HTTPAdapter):
+    """Answers every request with the next canned body, counting network sends."""
+
+    def __init__(self, *args, bodies=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.bodies = list(bodies)
+        self.sent = 0
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        self.sent += 1
+        response = Response()
+        response.status_code = 200
+        response._content = self.bodies.pop(0).encode()
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
+
+
+class StubCachingAdapter(CachingHTTPAdapter, StubAdapter):
+    pass
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return HttpCache(path=tmp_path / "http_cache.sqlite")
+
+
+def get_request(url: str = OFFER_URL.format(1), cookie: str = "") -> PreparedRequest:
+    headers = {"Cookie": cookie} if cookie else {}
+    return Request("GET", url, headers=headers).prepare()
+
+
+def test_challenge_pages_are_throttled_but_recaptcha_widgets_are_not():
+    assert is_throttled(200, CHALLENGE_PAGE)
+    assert not is_throttled(200, RECAPTCHA_PAGE)
+
+
+def test_fresh_response_is_served_from_cache(cache):
+    adapter = StubCachingAdapter(cache=cache, bodies=["offer"])
+    adapter.send(get_request())
+    assert adapter.send(get_request()).text == "offer"
+    assert adapter.sent == 1
+
+
+def test_throttled_response_is_not_stored(cache):
+    adapter = StubCachingAdapter(cache=cache, bodies=[CHALLENGE_PAGE, "offer"])
+    adapter.send(get_request())
+    assert adapter.send(get_request()).text == "offer"
+    assert adapter.sent == 2
+
+
+def test_logged_in_pages_are_not_shared_between_accounts(cache):
+    adapter = StubCachingAdapter(cache=cache, bodies=["anonymous", "alice", "bob"])
+    for cookie in ("", "session=alice", "session=bob"):
+        adapter.send(get_request(cookie=cookie))
+    assert adapter.send(get_request(cookie="session=alice")).text == "alice"
+    assert adapter.send(get_request(cookie="session=bob")).text == "bob"
+    assert adapter.send(get_request()).text == "anonymous"
+    assert adapter.sent == 3
@@ -0,0 +1,95 @@
+import pytest
+
+from src import index_scrapper
+from src.index_scrapper import ScraperManager
+from tests.helpers import OFFER_URL, listing_page
+
+MAX_PAGE = 10
+
+
+class FakeNavigator:
+    def __init__(self, pages):
+        self.pages = pages
+        self.fetched = []
+
+    def discover(self):
+        self.fetched.append(1)
+        return self.pages[1]
+
+    def fetch_page(self, page_num):
+        self.fetched.append(page_num)
+        # Past the last page the listing comes back empty.
+        return self.pages.get(page_num) or listing_page(page_num)
+
+    def page_url(self, page_num):
+        return f"https://www.pracuj.pl/praca?pn={page_num}"
+
+
+class FakeBrowserWorker:
+    """Scrapes page 1 the way the browser would when its HTTP fetch failed."""
+
+    def __init__(self, *args):
+        pass
+
+    def scrape_urls(self, url):
+        return [OFFER_URL.format(100), OFFER_URL.format(101)]
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def browser_worker(monkeypatch):
+    monkeypatch.setattr(index_scrapper, "BrowserWorker", FakeBrowserWorker)
+
+
+def crawl(pages, known_offer_ids, overlap_pages=1):
+    manager = ScraperManager(
+        "https://www.pracuj.pl/praca",
+        known_offer_ids=known_offer_ids,
+        overlap_pages=overlap_pages,
+    )
+    manager.page_navigator = FakeNavigator(pages)
+    results = list(manager._iter_incremental_results())
+    return [result.page_num for result in results]
+
+
+def numbered_pages(empty_pages=(), max_page=MAX_PAGE):
+    return {
+        page_num: listing_page(
+            page_num,
+            offer_ids=() if page_num in empty_pages else (page_num * 100, page_num * 100 + 1),
+            max_page=max_page,
+        )
+        for page_num in range(1, MAX_PAGE + 1)
+    }
+
+
+def test_empty_page_does_not_stop_the_crawl():
+    assert crawl(numbered_pages(empty_pages={2}), known_offer_ids=set()) == list(
+        range(1, MAX_PAGE + 1)
+    )
+
+
+def test_crawl_stops_after_overlap_of_known_pages():
+    known = {"300", "301", "400", "401"}
+    assert crawl(numbered_pages(), known_offer_ids=known, overlap_pages=2) == [1, 2, 3, 4]
+
+
+def test_promoted_offers_do_not_reset_the_overlap():
+    pages = numbered_pages()
+    pages[3].offers[0].promoted = True
+    known = {"301", "400", "401"}
+    assert crawl(pages, known_offer_ids=known, overlap_pages=2) == [1, 2, 3, 4]
+
+
+def test_failed_first_page_takes_the_page_count_from_later_pages(browser_worker):
+    pages = numbered_pages()
+    pages[1] = listing_page(1, needs_browser=True)
+    assert crawl(pages, known_offer_ids=set()) == list(range(1, MAX_PAGE + 1))
+
+
+def test_without_a_page_count_the_crawl_runs_until_an_empty_page(browser_worker):
+    pages = numbered_pages(max_page=None)
+    pages[1] = listing_page(1, needs_browser=True)
+    assert crawl(pages, known_offer_ids=set()) == list(range(1, MAX_PAGE + 1))
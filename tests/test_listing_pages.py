@@ -0,0 +1,65 @@
+import time
+
+import requests
+
+from src.index_scrapper import PageNavigator
+from tests.helpers import listing_page
+
+MAX_PAGE = 8
+
+
+class FakePageNavigator(PageNavigator):
+    def __init__(self, pages, delays=None):
+        # A bare session: pages never go over the network, the cache or the rate limiter.
+        super().__init__("https://www.pracuj.pl/praca", session=requests.Session())
+        self.pages = pages
+        self.delays = delays or {}
+
+    def fetch_page(self, page_num):
+        time.sleep(self.delays.get(page_num, 0))
+        return self.pages[page_num]
+
+
+def pages_with_count(max_page=MAX_PAGE, failed_first_page=False):
+    pages = {
+        page_num: listing_page(page_num, offer_ids=(page_num,), max_page=max_page)
+        for page_num in range(1, max_page + 1)
+    }
+    if failed_first_page:
+        pages[1] = listing_page(1, needs_browser=True)
+    return pages
+
+
+def crawled(navigator):
+    return [result.page_num for result in navigator.iter_pages(max_workers=4)]
+
+
+def test_all_pages_are_fetched_once_with_page_one_first():
+    pages = crawled(FakePageNavigator(pages_with_count(), delays={1: 0.05}))
+    assert pages[0] == 1
+    assert sorted(pages) == list(range(1, MAX_PAGE + 1))
+
+
+def test_page_count_comes_from_speculative_pages_when_page_one_fails():
+    navigator = FakePageNavigator(pages_with_count(failed_first_page=True), delays={1: 0.05})
+    pages = crawled(navigator)
+    assert pages[0] == 1
+    assert sorted(pages) == list(range(1, MAX_PAGE + 1))
+
+
+def test_failed_page_one_waits_for_speculative_pages():
+    navigator = FakePageNavigator(
+        pages_with_count(failed_first_page=True), delays={2: 0.05, 3: 0.05, 4: 0.05}
+    )
+    assert sorted(crawled(navigator)) == list(range(1, MAX_PAGE + 1))
+
+
+def test_speculative_pages_past_the_last_page_are_dropped():
+    pages = pages_with_count(max_page=2)
+    pages.update({3: listing_page(3, max_page=2), 4: listing_page(4, max_page=2)})
+    assert sorted(crawled(FakePageNavigator(pages))) == [1, 2]
+
+
+def test_single_page_when_no_page_reports_a_count():
+    pages = {page_num: listing_page(page_num) for page_num in range(1, 5)}
+    assert crawled(FakePageNavigator(pages)) == [1]
@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+from src.offer_classifier import OfferVerdict, classify_offer_page
+from src.page_selectors import ALREADY_APPLIED_MARKERS, EXPIRED_OFFER_MARKERS
+from tests.helpers import OFFER_URL
+
+URL = OFFER_URL.format(1)
+
+
+def state_page(offer: dict) -> str:
+    state = {"props": {"pageProps": {"offer": offer}}}
+    return (
+        '<html><script id="__NEXT_DATA__" type="application/json">'
+        f"{json.dumps(state)}</script></html>"
+    )
+
+
+@pytest.mark.parametrize(
+    "offer, verdict",
+    [
+        ({"isApplied": True, "oneClickApply": True}, OfferVerdict.ALREADY_APPLIED),
+        ({"isExpired": True, "oneClickApply": True}, OfferVerdict.EXPIRED),
+        ({"expirationDate": "2000-01-01T00:00:00Z"}, OfferVerdict.EXPIRED),
+        ({"oneClickApply": True}, OfferVerdict.FAST_APPLY),
+        ({"oneClickApply": False}, OfferVerdict.EXTERNAL),
+    ],
+)
+def test_verdict_from_embedded_state(offer, verdict):
+    assert classify_offer_page(URL, state_page(offer)).verdict == verdict
+
+
+def test_external_offer_keeps_only_off_site_apply_urls():
+    off_site = {"oneClickApply": False, "applyUrl": "https://jobs.example.com/apply/1"}
+    on_site = {"oneClickApply": False, "applyUrl": "https://www.pracuj.pl/aplikuj/1"}
+
+    classification = classify_offer_page(URL, state_page(off_site))
+    assert classification.external_url == off_site["applyUrl"]
+    assert not classification.needs_driver
+    assert classify_offer_page(URL, state_page(on_site)).needs_driver
+
+
+@pytest.mark.parametrize(
+    "marker, verdict",
+    [
+        (ALREADY_APPLIED_MARKERS[0], OfferVerdict.ALREADY_APPLIED),
+        (EXPIRED_OFFER_MARKERS[0], OfferVerdict.EXPIRED),
+    ],
+)
+def test_verdict_from_page_markers(marker, verdict):
+    classification = classify_offer_page(URL, f"<html><p>{marker}</p></html>")
+    assert classification.verdict == verdict
+    assert not classification.needs_driver
+
+
+def test_page_without_apply_button_falls_back_to_the_driver():
+    classification = classify_offer_page(URL, "<html>nothing</html>")
+    assert classification.verdict == OfferVerdict.NO_APPLY
+    assert classification.needs_driver
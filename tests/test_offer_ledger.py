@@ -0,0 +1,38 @@
+from src.offer_ledger import MAX_ATTEMPTS, OfferState
+from tests.helpers import OFFER_URL
+
+
+def test_new_offer_is_not_done(ledger):
+    assert not ledger.is_done("123")
+
+
+def test_completed_and_queued_offers_are_done(ledger):
+    for offer_id, state in enumerate(
+        (OfferState.FAST_APPLIED, OfferState.SKIPPED, OfferState.EXTERNAL_QUEUED)
+    ):
+        ledger.set_state(ledger.record_scraped(OFFER_URL.format(offer_id)), state)
+        assert ledger.is_done(str(offer_id))
+
+
+def test_failed_offer_is_retried_until_max_attempts(ledger):
+    offer_id = ledger.record_scraped(OFFER_URL.format(1))
+    for _ in range(MAX_ATTEMPTS - 1):
+        ledger.set_state(offer_id, OfferState.FAILED, error="boom")
+        assert not ledger.is_done(offer_id)
+    ledger.set_state(offer_id, OfferState.FAILED, error="boom")
+    assert ledger.is_done(offer_id)
+
+
+def test_finished_offer_ids_leave_out_unfinished_offers(ledger):
+    scraped = ledger.record_scraped(OFFER_URL.format(1))
+    classified = ledger.record_scraped(OFFER_URL.format(2))
+    ledger.set_state(classified, OfferState.CLASSIFIED)
+    retryable = ledger.record_scraped(OFFER_URL.format(3))
+    ledger.set_state(retryable, OfferState.FAILED)
+    applied = ledger.record_scraped(OFFER_URL.format(4))
+    ledger.set_state(applied, OfferState.FAST_APPLIED)
+
+    finished = ledger.finished_offer_ids()
+
+    assert finished == {applied}
+    assert not {scraped, classified, retryable} & finished
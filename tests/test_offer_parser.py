@@ -0,0 +1,111 @@
+import json
+
+import pytest
+
+from src.offer_parser import (
+    LISTING_BACKENDS,
+    ApplyType,
+    OfferRecord,
+    canonical_offer_id,
+    canonicalize_offer_url,
+    dedupe_offers,
+    parse_listing,
+)
+
+OFFER_URL = "https://www.pracuj.pl/praca/python-developer-warszawa,oferta,1001"
+PROMOTED_URL = f"{OFFER_URL}?s=abc&ref=boosterAI"
+SECOND_OFFER_URL = "https://www.pracuj.pl/praca/qa-engineer-krakow,oferta,1002"
+
+DOM_LISTING = f"""
+<html><body>
+  <a data-test="link-offer" href="{OFFER_URL}?s=123">Python Developer</a>
+  <a data-test="link-offer" href="{PROMOTED_URL}">Python Developer</a>
+  <a data-test="link-offer" href="{SECOND_OFFER_URL}">QA Engineer</a>
+  <span data-test="top-pagination-max-page-number">7</span>
+</body></html>
+"""
+
+JSON_STATE = {
+    "props": {
+        "pageProps": {
+            "data": {
+                "groupedOffers": [
+                    {
+                        "jobTitle": "Python Developer",
+                        "companyName": "ACME",
+                        "isOneClickApply": True,
+                        "offers": [{"offerAbsoluteUri": f"{OFFER_URL}?s=1"}],
+                    },
+                    {
+                        "jobTitle": "QA Engineer",
+                        "isOneClickApply": False,
+                        "isSuperOffer": True,
+                        "offers": [{"offerAbsoluteUri": SECOND_OFFER_URL}],
+                    },
+                ],
+                "pagination": {"maxPage": 4},
+            }
+        }
+    }
+}
+JSON_LISTING = (
+    f'<html><script id="__NEXT_DATA__" type="application/json">'
+    f"{json.dumps(JSON_STATE)}</script></html>"
+)
+
+DOM_BACKENDS = [name for name in LISTING_BACKENDS if name != "json"]
+
+
+def test_canonical_url_drops_query_and_trailing_slash():
+    assert canonicalize_offer_url(f"http://WWW.pracuj.pl/praca/x,oferta,1/?s=1") == (
+        "https://www.pracuj.pl/praca/x,oferta,1"
+    )
+
+
+def test_canonical_offer_id_prefers_the_numeric_id():
+    assert canonical_offer_id(PROMOTED_URL) == "1001"
+
+
+def test_canonical_offer_id_without_id_uses_the_canonical_url():
+    assert canonical_offer_id("https://www.pracuj.pl/praca/x/?a=1") == "www.pracuj.pl/praca/x"
+
+
+def test_dedupe_keeps_first_record_and_merges_promoted_flag():
+    offers = dedupe_offers(
+        [OfferRecord(url=OFFER_URL), OfferRecord(url=PROMOTED_URL, promoted=True)]
+    )
+    assert [offer.url for offer in offers] == [OFFER_URL]
+    assert offers[0].promoted
+
+
+@pytest.mark.parametrize("backend", DOM_BACKENDS)
+def test_dom_backends_agree(backend):
+    listing = parse_listing(DOM_LISTING, backend=backend)
+    assert listing.offer_urls == [OFFER_URL, SECOND_OFFER_URL]
+    assert listing.offers[0].promoted
+    assert listing.max_page == 7
+    assert not listing.has_hidden_offers
+
+
+@pytest.mark.parametrize("backend", DOM_BACKENDS)
+def test_dom_backends_detect_hidden_offers(backend):
+    page = '<div class="tiles_cobg3mp" tabindex="0" role="button"></div>'
+    listing = parse_listing(f"<html><body>{page}</body></html>", backend=backend)
+    assert listing.has_hidden_offers
+    assert listing.max_page == 1
+
+
+def test_json_state_is_preferred():
+    listing = parse_listing(JSON_LISTING)
+    assert listing.backend == "json"
+    assert listing.offer_urls == [OFFER_URL, SECOND_OFFER_URL]
+    assert listing.max_page == 4
+    assert listing.offers[0].apply_type == ApplyType.FAST
+    assert listing.offers[1].apply_type == ApplyType.EXTERNAL
+    assert listing.offers[1].promoted
+
+
+def test_auto_falls_back_to_dom_without_state():
+    listing = parse_listing(DOM_LISTING)
+    assert listing.backend != "json"
+    assert len(listing.offers) == 2
@@ -0,0 +1,111 @@
+import queue
+
+import pytest
+from selenium.common.exceptions import NoSuchWindowException, TimeoutException
+
+from src import applier
+from src.applier import TabPipeline
+from tests.helpers import OFFER_URL
+
+TAB_RESPONSE_MS = 120
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def new_window(self, kind):
+        self.driver.opened += 1
+        handle = f"tab-{self.driver.opened}"
+        self.driver.window_handles.append(handle)
+        self.driver.current_window_handle = handle
+
+    def window(self, handle):
+        if handle in self.driver.crashed_windows:
+            raise NoSuchWindowException(f"{handle} crashed")
+        self.driver.current_window_handle = handle
+
+
+class FakeDriver:
+    """
+    Loads tabs instantly, except those in `blank_windows`, which stay on about:blank.
+    The tabs in `crashed_windows` cannot be focused.
+    """
+
+    page_source = "<html></html>"
+
+    def __init__(self, crashed_windows=(), blank_windows=()):
+        self.window_handles = ["main"]
+        self.current_window_handle = "main"
+        self.crashed_windows = set(crashed_windows)
+        self.blank_windows = set(blank_windows)
+        self.tab_hosts = {}
+        self.opened = 0
+        self.switch_to = FakeSwitchTo(self)
+
+    def execute_script(self, script, *args):
+        if script.startswith("window.location.href"):
+            if self.current_window_handle not in self.blank_windows:
+                self.tab_hosts[self.current_window_handle] = "www.pracuj.pl"
+            return None
+        tab_host = self.tab_hosts.get(self.current_window_handle, "about:blank")
+        return TAB_RESPONSE_MS if tab_host == args[0] else None
+
+    def close(self):
+        self.window_handles.remove(self.current_window_handle)
+
+
+class FakeWait:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def until(self, condition):
+        value = condition(self.driver)
+        if not value:
+            raise TimeoutException("condition never held")
+        return value
+
+
+class RecordingLimiter:
+    def __init__(self):
+        self.reports = []
+
+    def acquire(self, host):
+        pass
+
+    def report(self, host, latency, throttled):
+        self.reports.append((host, latency))
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    recording = RecordingLimiter()
+    monkeypatch.setattr(applier, "default_rate_limiter", lambda: recording)
+    return recording
+
+
+def queued(*urls):
+    work_queue = queue.Queue()
+    for url in (*urls, None):
+        work_queue.put(url)
+    return work_queue
+
+
+def test_offer_whose_tab_crashed_is_reported_and_the_rest_go_on(limiter):
+    urls = [OFFER_URL.format(offer_id) for offer_id in range(1, 4)]
+    driver = FakeDriver(crashed_windows={"tab-2"})
+    tabs = TabPipeline(driver, FakeWait(driver), depth=1)
+
+    loaded = [(url, error is None) for url, error in tabs.iter_loaded(queued(*urls))]
+
+    assert loaded == [(urls[0], True), (urls[1], False), (urls[2], True)]
+
+
+def test_only_tabs_that_reached_the_offer_report_their_latency(limiter):
+    urls = [OFFER_URL.format(offer_id) for offer_id in range(1, 3)]
+    driver = FakeDriver(blank_windows={"tab-1"})
+    tabs = TabPipeline(driver, FakeWait(driver), depth=1)
+
+    list(tabs.iter_loaded(queued(*urls)))
+
+    assert limiter.reports == [("www.pracuj.pl", TAB_RESPONSE_MS / 1000)]